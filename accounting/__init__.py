@@ -0,0 +1,2 @@
+# accounting/__init__.py
+# Shared computation engines used by the Streamlit pages.
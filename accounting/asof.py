@@ -0,0 +1,70 @@
+# accounting/asof.py
+
+import numpy as np
+import pandas as pd
+
+from accounting.checkpoint import LayerState, advance
+
+ASOF_COLUMNS = ["As Of", "Events", "On Hand Qty", "COGS to Date", "Ending Inventory"]
+
+
+# ------------------------------
+# ✅ Point-in-time valuation index
+# ------------------------------
+class ValuationIndex:
+    """Answer "what was inventory worth on date D" without a full replay.
+
+    Building the index replays the history once and keeps a LayerState
+    snapshot every `every` events. A query binary-searches the event dates,
+    starts from the nearest snapshot at or before that point and replays
+    at most `every - 1` tail events. FIFO / LIFO snapshots hold every open
+    layer, so memory grows with `len(table) / every` times the open layers.
+    """
+
+    def __init__(self, table, method, every=10_000):
+        self.table = table
+        self.method = method
+        self.every = max(int(every), 1)
+        self.dates = table["Date"].to_numpy()
+
+        state = LayerState(method)
+        self.snapshots = [state]
+        for lo in range(0, len(table) - self.every + 1, self.every):
+            state, _ = advance(state, table.iloc[lo:lo + self.every], keep_flow=False)
+            self.snapshots.append(state)
+
+    def _replay_to(self, n_events, start=None):
+        snapshot = self.snapshots[n_events // self.every]
+        if start is None or start.n_events < snapshot.n_events or start.n_events > n_events:
+            start = snapshot
+        state, _ = advance(start, self.table.iloc[start.n_events:n_events], keep_flow=False)
+        return state
+
+    def events_through(self, when):
+        """Number of events dated on or before `when`."""
+        if np.issubdtype(self.dates.dtype, np.datetime64):
+            # Match the array's unit so searchsorted stays a typed binary search
+            when = np.datetime64(pd.Timestamp(when)).astype(self.dates.dtype)
+        return int(np.searchsorted(self.dates, when, side="right"))
+
+    def at(self, when):
+        """LayerState including every event dated on or before `when`."""
+        return self._replay_to(self.events_through(when))
+
+    def value_many(self, dates):
+        """Point-in-time valuations for many dates, one row per date.
+
+        Dates are answered in ascending order so a query can continue from
+        the previous answer when that is closer than the nearest snapshot.
+        """
+        dates = pd.Series(dates)
+        rows = {}
+        state = None
+        for when in dates.sort_values().unique():
+            state = self._replay_to(self.events_through(when), state)
+            rows[when] = (state.n_events, state.onhand, state.cogs, state.ending_inventory)
+
+        return pd.DataFrame(
+            [(when, *rows[when]) for when in dates],
+            columns=ASOF_COLUMNS,
+        )
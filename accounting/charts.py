@@ -0,0 +1,21 @@
+# accounting/charts.py
+
+
+def bar_chart(x, heights, title, color=None, xlabel=None, ylabel=None):
+    """A bar chart figure ready for st.pyplot.
+
+    matplotlib is the slowest import in the app, so it is loaded on the
+    first chart rather than when a page starts. The figure is closed
+    before it is returned so pyplot does not keep every chart alive.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.bar(x, heights, color=color)
+    ax.set_title(title)
+    if xlabel:
+        ax.set_xlabel(xlabel)
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    plt.close(fig)
+    return fig
@@ -0,0 +1,220 @@
+# accounting/checkpoint.py
+
+import hashlib
+import os
+import re
+import threading
+import zipfile
+
+import numpy as np
+
+from accounting.inventory import PerpetualLayers, moving_average, table_events
+from accounting.store import LayerStore, RecordStore, average_flow_dtype, flow_dtype
+
+_FILE_PATTERN = re.compile(r"^(?P<method>[\w-]+)-(?P<n>\d+)-(?P<digest>[0-9a-f]+)\.npz$")
+
+
+# ------------------------------
+# ✅ Layer state after a prefix of the event history
+# ------------------------------
+class LayerState:
+    """Inventory position after the first `n_events` events of a history.
+
+    FIFO / LIFO keep every open purchase layer; weighted average keeps a
+    single layer holding the on-hand quantity at the running average cost.
+    `shortfall` is the quantity FIFO / LIFO sales asked for beyond what was
+    on hand (left uncosted); weighted average raises instead.
+    """
+
+    __slots__ = ("method", "n_events", "layer_qty", "layer_cost", "cogs", "shortfall")
+
+    def __init__(self, method, n_events=0, layer_qty=None, layer_cost=None, cogs=0.0, shortfall=0.0):
+        self.method = method
+        self.n_events = n_events
+        self.layer_qty = np.asarray(layer_qty if layer_qty is not None else [], dtype=np.float64)
+        self.layer_cost = np.asarray(layer_cost if layer_cost is not None else [], dtype=np.float64)
+        self.cogs = float(cogs)
+        self.shortfall = float(shortfall)
+
+    @property
+    def onhand(self):
+        return float(self.layer_qty.sum())
+
+    @property
+    def ending_inventory(self):
+        return float(np.dot(self.layer_qty, self.layer_cost))
+
+    def save(self, path):
+        np.savez(path, layer_qty=self.layer_qty, layer_cost=self.layer_cost,
+                 cogs=self.cogs, n_events=self.n_events, shortfall=self.shortfall)
+
+    @classmethod
+    def load(cls, path, method):
+        with np.load(path) as data:
+            return cls(method, int(data["n_events"]), data["layer_qty"], data["layer_cost"],
+                       float(data["cogs"]), float(data["shortfall"]))
+
+
+def advance(state, table, keep_flow=True):
+    """Apply the events in `table` (an event_table slice) on top of `state`.
+
+    Returns (new_state, flow) where flow is a RecordStore of the flow steps
+    for just these events, or None when `keep_flow` is False.
+    """
+    time_dtype = table["Date"].dtype
+    if state.method in ("FIFO", "LIFO"):
+        engine = PerpetualLayers(state.method, LayerStore.from_arrays(state.layer_qty, state.layer_cost))
+        engine.cogs = state.cogs
+        engine.shortfall = state.shortfall
+        rows = engine.run(table_events(table))
+        if keep_flow:
+            flow = RecordStore(flow_dtype(time_dtype))
+            flow.extend(rows)
+        else:
+            flow = None
+            for _ in rows:
+                pass
+        layer_qty, layer_cost = engine.layers.live
+        return LayerState(state.method, state.n_events + len(table), layer_qty, layer_cost,
+                          engine.cogs, engine.shortfall), flow
+
+    # Weighted average: carry the opening position in as a leading purchase
+    is_sale = table["Sale"].to_numpy(dtype=bool)
+    qty = table["Qty"].to_numpy(dtype=np.float64)
+    cost = table["Cost"].to_numpy(dtype=np.float64)
+    opening_qty = state.onhand
+    opening_cost = state.ending_inventory / opening_qty if opening_qty else 0.0
+    # The padding shifts indexes by one; errors name the event in the whole history
+    avg_cost, onhand = moving_average(
+        np.r_[True, ~is_sale], np.r_[opening_qty, qty], np.r_[opening_cost, cost],
+        first_event=state.n_events - 1,
+    )
+    avg_cost, onhand = avg_cost[1:], onhand[1:]
+
+    sale_cogs = qty[is_sale] * avg_cost[is_sale]
+    flow = RecordStore.from_columns(average_flow_dtype(time_dtype), {
+        "Time": table["Date"].to_numpy()[is_sale],
+        "Sale Qty": qty[is_sale],
+        "Avg Cost": avg_cost[is_sale],
+        "COGS for Sale": sale_cogs,
+    }) if keep_flow else None
+    if len(onhand):
+        layer_qty, layer_cost = [onhand[-1]], [avg_cost[-1]]
+    else:
+        layer_qty, layer_cost = state.layer_qty, state.layer_cost
+    new_state = LayerState(state.method, state.n_events + len(table), layer_qty, layer_cost,
+                           state.cogs + float(sale_cogs.sum()))
+    return new_state, flow
+
+
+# ------------------------------
+# ✅ Persisted checkpoints
+# ------------------------------
+def _event_bytes(table):
+    """Fixed-width byte image of the events, used to fingerprint a prefix."""
+    dates = table["Date"].to_numpy()
+    times = dates.astype("datetime64[ns]").view("i8") if np.issubdtype(dates.dtype, np.datetime64) else dates
+    records = np.empty(len(table), dtype=[("time", "i8"), ("sale", "u1"), ("qty", "f8"), ("cost", "f8")])
+    records["time"] = times
+    records["sale"] = table["Sale"].to_numpy(dtype=bool)
+    records["qty"] = table["Qty"].to_numpy(dtype=np.float64)
+    records["cost"] = table["Cost"].to_numpy(dtype=np.float64)
+    return memoryview(records.view(np.uint8)), records.dtype.itemsize
+
+
+def _remove(path):
+    # Another session replaying the same lineage may have removed it first
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _load(path, method):
+    """The checkpoint at `path`, or None when it is missing or unreadable."""
+    try:
+        return LayerState.load(path, method)
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def lineage_directory(directory, table, label=""):
+    """Checkpoint directory for the history `table` belongs to.
+
+    A lineage is named by `label` (e.g. the upload's file name) and the
+    first event, so appending to or editing a history keeps its lineage
+    while a different dataset gets its own directory and never
+    invalidates another's checkpoints.
+    """
+    data, width = _event_bytes(table.iloc[:1])
+    head = hashlib.blake2b(bytes(data[:width]), digest_size=8).hexdigest() if len(table) else "empty"
+    slug = re.sub(r"[^\w.-]+", "_", label).strip("._") or "history"
+    return os.path.join(directory, f"{slug}-{head}")
+
+
+def _checkpoints(directory, method):
+    """Saved (n_events, digest, path) for `method`, oldest first."""
+    slug = method.replace(" ", "_")
+    found = []
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            match = _FILE_PATTERN.match(name)
+            if match and match["method"] == slug:
+                found.append((int(match["n"]), match["digest"], os.path.join(directory, name)))
+    return sorted(found)
+
+
+def value_incrementally(table, method, directory, label="", keep=8):
+    """Value `table` (an event_table) starting from the newest valid checkpoint.
+
+    Checkpoints are kept per lineage (see lineage_directory) under
+    `directory`. A checkpoint is valid when the digest of the first n
+    events it covers still matches the history and the file loads, so
+    editing an older event invalidates every checkpoint after it in that
+    lineage; those are deleted. Only the events past the checkpoint are
+    replayed, and the result is saved as a new checkpoint (the newest
+    `keep` are retained).
+
+    Returns (state, resumed_from, flow) where flow covers only the
+    replayed events.
+    """
+    directory = lineage_directory(directory, table, label)
+    data, width = _event_bytes(table)
+    digest = hashlib.blake2b(digest_size=16)
+    valid = digest.copy()
+    state = LayerState(method)
+    saved = _checkpoints(directory, method)
+
+    position = 0
+    stale = []
+    for i, (n_events, expected, path) in enumerate(saved):
+        if n_events > len(table):
+            stale = saved[i:]
+            break
+        digest.update(data[position * width:n_events * width])
+        position = n_events
+        loaded = _load(path, method) if digest.hexdigest() == expected else None
+        if loaded is None or loaded.n_events != n_events:
+            stale = saved[i:]
+            break
+        valid = digest.copy()
+        state = loaded
+    for _, _, path in stale:
+        _remove(path)
+
+    resumed_from = state.n_events
+    state, flow = advance(state, table.iloc[resumed_from:])
+
+    if state.n_events > resumed_from:
+        valid.update(data[resumed_from * width:])
+        os.makedirs(directory, exist_ok=True)
+        slug = method.replace(" ", "_")
+        path = os.path.join(directory, f"{slug}-{state.n_events}-{valid.hexdigest()}.npz")
+        # Write aside and rename, so a concurrent reader never sees half a file
+        partial = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        with open(partial, "wb") as f:
+            state.save(f)
+        os.replace(partial, path)
+        for _, _, old in _checkpoints(directory, method)[:-keep]:
+            _remove(old)
+    return state, resumed_from, flow
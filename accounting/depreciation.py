@@ -0,0 +1,38 @@
+# accounting/depreciation.py
+
+import pandas as pd
+
+DEPRECIATION_METHODS = ["Straight-Line", "Double Declining Balance", "Units of Production"]
+
+
+def depreciation_schedule(method, cost, salvage, useful_life, total_units=None, units_per_year=()):
+    """Year-by-year depreciation expense as a Year / Depreciation frame."""
+    schedule = []
+
+    if method == "Straight-Line":
+        annual_dep = (cost - salvage) / useful_life
+        for year in range(1, useful_life + 1):
+            schedule.append({"Year": year, "Depreciation": annual_dep})
+
+    elif method == "Double Declining Balance":
+        book_value = cost
+        rate = 2 / useful_life
+        for year in range(1, useful_life + 1):
+            dep = book_value * rate
+            if book_value - dep < salvage:
+                dep = book_value - salvage
+            schedule.append({"Year": year, "Depreciation": dep})
+            book_value -= dep
+
+    elif method == "Units of Production":
+        if not total_units:
+            raise ValueError("Units of Production needs the estimated total units")
+        dep_per_unit = (cost - salvage) / total_units
+        for year, units in enumerate(units_per_year, start=1):
+            dep = units * dep_per_unit
+            schedule.append({"Year": year, "Depreciation": dep})
+
+    else:
+        raise ValueError(f"Unsupported depreciation method: {method}")
+
+    return pd.DataFrame(schedule, columns=["Year", "Depreciation"])
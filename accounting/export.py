@@ -0,0 +1,75 @@
+# accounting/export.py
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _columns(table):
+    """(name, array) pairs for a DataFrame, RecordStore, structured array or dict."""
+    if isinstance(table, pd.DataFrame):
+        return [(str(name), table[name].to_numpy()) for name in table.columns]
+    if isinstance(table, dict):
+        return [(str(name), np.asarray(values)) for name, values in table.items()]
+    rows = table.rows if hasattr(table, "rows") else table
+    return [(name, rows[name]) for name in rows.dtype.names]
+
+
+def _python_values(values):
+    # datetime64[ns].tolist() yields raw ints; go through microseconds for datetimes
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[us]").tolist()
+    return values.tolist()
+
+
+# ------------------------------
+# ✅ Constant-memory multi-sheet workbook
+# ------------------------------
+def write_workbook(path, sheets, chunk_size=50_000):
+    """Write `sheets` (an iterable of (sheet name, table) pairs) to `path`.
+
+    xlsxwriter runs in constant-memory mode, so each row is flushed to disk
+    as soon as the next one starts. Rows are converted from the source
+    arrays one chunk at a time and each header format is created once.
+    """
+    import xlsxwriter  # imported on first export, not on page load
+
+    workbook = xlsxwriter.Workbook(path, {
+        "constant_memory": True,
+        "nan_inf_to_errors": True,
+        "default_date_format": "yyyy-mm-dd",
+    })
+    header_format = workbook.add_format({"bold": True, "border": 1})
+    try:
+        for sheet_name, table in sheets:
+            worksheet = workbook.add_worksheet(sheet_name)
+            columns = _columns(table)
+            worksheet.write_row(0, 0, [name for name, _ in columns], header_format)
+
+            n_rows = len(columns[0][1]) if columns else 0
+            row_num = 1
+            for lo in range(0, n_rows, chunk_size):
+                chunk = [_python_values(values[lo:lo + chunk_size]) for _, values in columns]
+                for row in zip(*chunk):
+                    worksheet.write_row(row_num, 0, row)
+                    row_num += 1
+    finally:
+        workbook.close()
+
+
+def workbook_bytes(sheets, chunk_size=50_000):
+    """Write `sheets` to a temporary .xlsx and return its bytes.
+
+    Meant to be handed to `st.download_button` as a deferred callable, so the
+    workbook is only built when the user asks for it. Writing stays in
+    constant memory; the finished file is read back once for the download.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "workbook.xlsx")
+        write_workbook(path, sheets, chunk_size)
+        with open(path, "rb") as f:
+            return f.read()
@@ -0,0 +1,168 @@
+# accounting/graph.py
+
+import hashlib
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class Node:
+    """Output of one stage run, identified by the key of everything it was built from."""
+
+    __slots__ = ("name", "key", "value")
+
+    def __init__(self, name, key, value):
+        self.name = name
+        self.key = key
+        self.value = value
+
+    def split(self):
+        """One Node per item of a tuple-valued result, e.g. (table, errors)."""
+        return tuple(Node(f"{self.name}[{i}]", f"{self.key}/{i}", item) for i, item in enumerate(self.value))
+
+
+def fingerprint(value):
+    """Stable digest of a stage input.
+
+    Nodes contribute their key, so a downstream stage never re-hashes an
+    upstream result; raw inputs (widget values, uploads, frames, arrays)
+    are hashed by content.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    _feed(h, value)
+    return h.hexdigest()
+
+
+def _feed(h, value):
+    if isinstance(value, Node):
+        h.update(b"N" + value.key.encode())
+    elif value is None or isinstance(value, (str, bytes, int, float, bool)):
+        h.update(type(value).__name__.encode() + repr(value).encode())
+    elif isinstance(value, (list, tuple)):
+        h.update(b"(")
+        for item in value:
+            _feed(h, item)
+        h.update(b")")
+    elif isinstance(value, dict):
+        h.update(b"{")
+        for k in sorted(value, key=repr):
+            _feed(h, k)
+            _feed(h, value[k])
+        h.update(b"}")
+    elif isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr(value.columns if isinstance(value, pd.DataFrame) else value.name).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(str(value.dtype).encode() + repr(value.shape).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif hasattr(value, "getvalue"):
+        # Uploaded files and other in-memory buffers
+        h.update(getattr(value, "name", "").encode())
+        h.update(value.getvalue())
+    else:
+        h.update(pickle.dumps(value))
+
+
+def approx_size(value, _depth=0):
+    """Rough in-memory size of a stage result, in bytes.
+
+    Frames and arrays report their buffers; containers and plain objects
+    are walked a few levels deep. Object-dtype cells count as pointers, so
+    text-heavy frames are underestimated.
+    """
+    if isinstance(value, Node):
+        value = value.value
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if _depth >= 3 or isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(approx_size(item, _depth + 1) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approx_size(item, _depth + 1) for item in value.values())
+    slots = getattr(type(value), "__slots__", ())
+    attrs = list(getattr(value, "__dict__", {}).values()) + [getattr(value, s) for s in slots if hasattr(value, s)]
+    return sys.getsizeof(value) + sum(approx_size(item, _depth + 1) for item in attrs)
+
+
+# ------------------------------
+# ✅ Memoized stage graph
+# ------------------------------
+class StageGraph:
+    """Memoizes page stages (parse → compute → render) on their inputs.
+
+    Each `node` call is keyed on the stage name and the fingerprint of its
+    inputs. Inputs that are Nodes from earlier stages carry their own key,
+    so when an input changes only the stages downstream of it get a new key
+    and recompute; everything upstream is a cache hit. At most `maxsize`
+    results and roughly `max_bytes` of them (see `approx_size`) are kept,
+    least recently used first out; a result larger than `max_bytes` is
+    returned but not cached. Cached values are shared between reruns, so
+    callers must treat them as read-only.
+
+    A graph may be shared between threads: the cache itself is locked,
+    stages run outside the lock.
+    """
+
+    def __init__(self, maxsize=64, max_bytes=256 * 2**20):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._cache = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def node(self, name, fn, *args, **kwargs):
+        key = fingerprint((name, getattr(fn, "__qualname__", repr(fn)), args, kwargs))
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        values = [a.value if isinstance(a, Node) else a for a in args]
+        kw_values = {k: v.value if isinstance(v, Node) else v for k, v in kwargs.items()}
+        result = Node(name, key, fn(*values, **kw_values))
+        size = approx_size(result.value)
+        if size > self.max_bytes:
+            return result
+        with self._lock:
+            if key not in self._cache:
+                self._cache[key] = result
+                self._sizes[key] = size
+                self.nbytes += size
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize or self.nbytes > self.max_bytes:
+                old, _ = self._cache.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+        return result
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+
+def page_graph(page, maxsize=64, max_bytes=64 * 2**20):
+    """The StageGraph for `page` in the current Streamlit session."""
+    import streamlit as st
+
+    graphs = st.session_state.setdefault("_stage_graphs", {})
+    if page not in graphs:
+        graphs[page] = StageGraph(maxsize, max_bytes)
+    return graphs[page]
@@ -0,0 +1,152 @@
+# accounting/instrument.py
+
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger("accounting.perf")
+
+# Set to a file path to append every stage record as a JSON line
+LOG_PATH_ENV = "ACCOUNTING_PERF_LOG"
+
+STAGE_COLUMNS = ["page", "stage", "calls", "seconds", "peak_mem_mb"]
+
+# tracemalloc is process-wide: sessions that asked for memory tracking hold a
+# token here, and tracing only stops once the last of them lets go (and only
+# if this module was the one that started it)
+_trace_lock = threading.Lock()
+_trace_tokens = weakref.WeakSet()
+_trace_state = {"started": False, "generation": 0}
+
+
+# ------------------------------
+# ✅ Per-stage timing & memory
+# ------------------------------
+class StageRecorder:
+    """Collects wall time (and, while tracemalloc runs, peak memory) per stage.
+
+    Every record is emitted as a JSON log line on the `accounting.perf`
+    logger and, when $ACCOUNTING_PERF_LOG is set, appended to that file.
+    Stages are meant to be run one after another; a nested stage resets
+    the tracemalloc peak seen by the stage around it. Peak memory is None
+    when tracing was off, or was stopped or restarted, during the stage.
+    """
+
+    def __init__(self, page, show_panel=False):
+        self.page = page
+        self.show_panel = show_panel
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        tracing = tracemalloc.is_tracing()
+        generation = _trace_state["generation"]
+        if tracing:
+            tracemalloc.reset_peak()
+            mem_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            traced = tracing and tracemalloc.is_tracing() and _trace_state["generation"] == generation
+            record = {
+                "ts": time.time(),
+                "page": self.page,
+                "stage": name,
+                "seconds": time.perf_counter() - start,
+                "peak_mem_bytes": tracemalloc.get_traced_memory()[1] - mem_before if traced else None,
+            }
+            self.records.append(record)
+            self._emit(record)
+
+    def _emit(self, record):
+        line = json.dumps(record)
+        logger.info(line)
+        path = os.environ.get(LOG_PATH_ENV)
+        if path:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def summary(self):
+        """One row per stage: call count, total seconds and worst peak memory."""
+        if not self.records:
+            return pd.DataFrame(columns=STAGE_COLUMNS)
+        df = pd.DataFrame(self.records)
+        df["peak_mem_mb"] = pd.to_numeric(df["peak_mem_bytes"], errors="coerce") / 1e6
+        out = df.groupby(["page", "stage"], sort=False).agg(
+            calls=("seconds", "size"), seconds=("seconds", "sum"), peak_mem_mb=("peak_mem_mb", "max"),
+        ).reset_index()
+        return out[STAGE_COLUMNS]
+
+    def to_jsonl(self):
+        return "".join(json.dumps(record) + "\n" for record in self.records)
+
+
+# ------------------------------
+# ✅ Shared tracemalloc switch
+# ------------------------------
+class _TraceToken:
+    """Held in a session's state while that session wants memory tracking."""
+
+
+def _want_tracing(token, enabled):
+    """Register (or drop) one session's interest in tracemalloc.
+
+    Tracing starts with the first interested session and stops when the
+    last one drops out; sessions that end are released with their state.
+    """
+    with _trace_lock:
+        if enabled:
+            _trace_tokens.add(token)
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _trace_state["started"] = True
+                _trace_state["generation"] += 1
+        else:
+            _trace_tokens.discard(token)
+            if not _trace_tokens and _trace_state["started"]:
+                _trace_state["started"] = False
+                if tracemalloc.is_tracing():
+                    tracemalloc.stop()
+
+
+# ------------------------------
+# ✅ Streamlit sidebar panel
+# ------------------------------
+def page_recorder(page):
+    """Recorder for one run of a page script, plus its sidebar toggles.
+
+    Call at the top of the page so memory tracking is switched on before
+    the first stage runs; call `render_panel` at the bottom.
+    """
+    import streamlit as st
+
+    show_panel = st.sidebar.checkbox("🔬 Performance panel", key="perf_panel")
+    track_memory = show_panel and st.sidebar.checkbox("Track memory (slower)", key="perf_memory")
+    token = st.session_state.setdefault("_perf_trace_token", _TraceToken())
+    _want_tracing(token, track_memory)
+    return StageRecorder(page, show_panel)
+
+
+def render_panel(recorder):
+    import streamlit as st
+
+    if not recorder.show_panel:
+        return
+    st.sidebar.write("### 🔬 Stage Timings")
+    summary = recorder.summary()
+    st.sidebar.dataframe(summary.drop(columns="page"), use_container_width=True, hide_index=True)
+    st.sidebar.caption(f"Total: {summary['seconds'].sum() * 1000:,.1f} ms this run")
+    st.sidebar.download_button(
+        "📥 Download Stage Log (JSONL)",
+        recorder.to_jsonl().encode("utf-8"),
+        f"{recorder.page.lower().replace(' ', '_')}_stages.jsonl",
+        "application/json",
+    )
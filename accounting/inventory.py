@@ -0,0 +1,266 @@
+# accounting/inventory.py
+
+import numpy as np
+import pandas as pd
+
+from accounting.store import LayerStore
+
+PURCHASE = "P"
+SALE = "S"
+
+
+# ------------------------------
+# ✅ Periodic FIFO / LIFO layer engine
+# ------------------------------
+def periodic_layers(qty, cost, total_sales, method="FIFO"):
+    """Consume `total_sales` units from the purchase layers in one pass.
+
+    Layers are walked in purchase order for FIFO and in reverse for LIFO.
+    The layer holding the last unit sold is found with a binary search on
+    cumulative quantity, so COGS and ending inventory come straight from
+    prefix sums instead of a per-row loop.
+
+    Returns (cogs, ending_inv, flow_df, remaining) where `remaining` is the
+    quantity left in each purchase layer, in purchase order.
+    """
+    qty = np.asarray(qty, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+    if method not in ("FIFO", "LIFO"):
+        raise ValueError(f"Unsupported layer method: {method}")
+
+    order = slice(None) if method == "FIFO" else slice(None, None, -1)
+    q = qty[order]
+    c = cost[order]
+
+    cum_qty = np.cumsum(q)
+    cum_val = np.cumsum(q * c)
+    total_val = cum_val[-1] if len(cum_val) else 0.0
+
+    remaining = q.copy()
+    if total_sales <= 0 or len(q) == 0:
+        flow_df = pd.DataFrame({"Qty Used": [], "Cost": [], "Total Cost": []})
+        return 0.0, float(total_val), flow_df, remaining[order]
+
+    # k = layer that holds the last unit sold
+    k = min(int(np.searchsorted(cum_qty, total_sales, side="left")), len(q) - 1)
+    prev_qty = cum_qty[k - 1] if k else 0.0
+    prev_val = cum_val[k - 1] if k else 0.0
+    last_used = min(q[k], total_sales - prev_qty)
+
+    cogs = prev_val + last_used * c[k]
+    ending_inv = total_val - cogs
+
+    used = q[:k + 1].copy()
+    used[k] = last_used
+    remaining[:k] = 0.0
+    remaining[k] -= last_used
+
+    flow_df = pd.DataFrame({
+        "Qty Used": used,
+        "Cost": c[:k + 1],
+        "Total Cost": used * c[:k + 1],
+    })
+    return float(cogs), float(ending_inv), flow_df, remaining[order]
+
+
+# ------------------------------
+# ✅ Perpetual FIFO / LIFO event engine
+# ------------------------------
+def event_table(purchases, sales):
+    """One time-ordered table of purchase and sale events.
+
+    `purchases` has Date, Qty, Cost columns and `sales` has Date and
+    Sales Qty. Returns Date, Qty, Cost, Sale columns sorted by date with
+    purchases ahead of sales on the same date.
+    """
+    return pd.concat([
+        purchases[["Date", "Qty", "Cost"]].assign(Sale=False),
+        sales[["Date", "Sales Qty"]].rename(columns={"Sales Qty": "Qty"}).assign(Cost=0.0, Sale=True),
+    ], ignore_index=True).sort_values(["Date", "Sale"], kind="stable", ignore_index=True)
+
+
+def table_events(table, chunk_size=65_536):
+    """Iterate an event_table as (time, kind, qty, cost) tuples for PerpetualLayers.run.
+
+    Rows are converted to Python values one chunk at a time, and dates as
+    integer ticks of the column's datetime64 unit rather than Timestamps,
+    so only the current chunk is ever materialized.
+    """
+    times = table["Date"].to_numpy()
+    if np.issubdtype(times.dtype, np.datetime64):
+        times = times.view("i8")
+    kinds = np.where(table["Sale"].to_numpy(dtype=bool), SALE, PURCHASE)
+    qty = table["Qty"].to_numpy(dtype=np.float64)
+    cost = table["Cost"].to_numpy(dtype=np.float64)
+    for lo in range(0, len(times), chunk_size):
+        hi = lo + chunk_size
+        yield from zip(times[lo:hi].tolist(), kinds[lo:hi].tolist(), qty[lo:hi].tolist(), cost[lo:hi].tolist())
+
+
+class PerpetualLayers:
+    """Perpetual FIFO / LIFO costing over a time-ordered event stream.
+
+    Layers live in a LayerStore: purchases are pushed at the tail, FIFO
+    sales draw from the head and LIFO sales from the tail. Each layer is
+    pushed and fully consumed at most once, so every event is amortized O(1).
+    """
+
+    def __init__(self, method="FIFO", layers=None):
+        if method not in ("FIFO", "LIFO"):
+            raise ValueError(f"Unsupported layer method: {method}")
+        self.method = method
+        self.layers = layers if layers is not None else LayerStore()
+        self.cogs = 0.0
+        self.shortfall = 0.0
+        self.last_time = None
+
+    def purchase(self, qty, cost):
+        if qty > 0:
+            self.layers.push(qty, cost)
+
+    def _draw(self, qty):
+        layers = self.layers
+        fifo = self.method == "FIFO"
+        while qty > 0 and len(layers):
+            i = layers.head if fifo else layers.tail - 1
+            available = float(layers.qty[i])
+            unit_cost = float(layers.cost[i])
+            use_qty = min(available, qty)
+            qty -= use_qty
+            if use_qty < available:
+                layers.qty[i] = available - use_qty
+            elif fifo:
+                layers.head += 1
+            else:
+                layers.tail -= 1
+            self.cogs += use_qty * unit_cost
+            yield use_qty, unit_cost
+        # Sales beyond what is on hand are not costed
+        self.shortfall += qty
+
+    def run(self, events):
+        """Apply (time, kind, qty, cost) events in order.
+
+        Yields one flow row (time, qty used, unit cost, total cost) per
+        layer drawn, so callers can stream rows without holding them all.
+        """
+        for time, kind, qty, cost in events:
+            if self.last_time is not None and time < self.last_time:
+                raise ValueError(f"Event at {time} is earlier than {self.last_time}")
+            self.last_time = time
+
+            if kind == PURCHASE:
+                self.purchase(qty, cost)
+            elif kind == SALE:
+                for use_qty, unit_cost in self._draw(qty):
+                    yield time, use_qty, unit_cost, use_qty * unit_cost
+            else:
+                raise ValueError(f"Unknown event kind: {kind}")
+
+    @property
+    def ending_inventory(self):
+        return self.layers.value
+
+
+# ------------------------------
+# ✅ Perpetual moving-average engine
+# ------------------------------
+def _value_recurrence(carry, added, start):
+    """Sequential V[i] = carry[i] * V[i-1] + added[i], seeded with `start`."""
+    out = np.empty_like(added)
+    value = start
+    for i in range(len(added)):
+        value = carry[i] * value + added[i]
+        out[i] = value
+    return out
+
+
+_sequential_kernel = None
+
+
+def _sequential_values(carry, added, start):
+    """_value_recurrence, compiled with numba on first use when it is installed.
+
+    numba is imported here rather than at module load so pages that never
+    hit the fallback do not pay for it on startup.
+    """
+    global _sequential_kernel
+    if _sequential_kernel is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional; the chunked NumPy path covers it
+            _sequential_kernel = _value_recurrence
+        else:
+            _sequential_kernel = njit(cache=True)(_value_recurrence)
+    return _sequential_kernel(carry, added, start)
+
+
+def _layer_values(carry, added, chunk_size=1024):
+    """Inventory value after each purchase, solved chunk by chunk.
+
+    Within a run of purchases the recurrence has the closed form
+    V[i] = R[i] * (V0 + cumsum(added / R)[i]) with R = cumprod(carry).
+    A carry of 0 (stock ran out) restarts the run from zero. Chunks with
+    many restarts, or where R underflows, fall back to the sequential
+    kernel, compiled with numba when it is installed.
+    """
+    values = np.empty_like(added)
+    start = 0.0
+    for lo in range(0, len(added), chunk_size):
+        hi = min(lo + chunk_size, len(added))
+        resets = np.flatnonzero(carry[lo:hi] == 0) + lo
+        if len(resets) > 8:
+            values[lo:hi] = _sequential_values(carry[lo:hi], added[lo:hi], start)
+            start = values[hi - 1]
+            continue
+
+        bounds = sorted({lo, hi, *resets.tolist()})
+        for seg_lo, seg_hi in zip(bounds[:-1], bounds[1:]):
+            r = carry[seg_lo:seg_hi].copy()
+            if r[0] == 0:
+                r[0], start = 1.0, 0.0
+            running = np.cumprod(r)
+            if running[-1] > 1e-200:
+                values[seg_lo:seg_hi] = running * (start + np.cumsum(added[seg_lo:seg_hi] / running))
+            else:
+                values[seg_lo:seg_hi] = _sequential_values(r, added[seg_lo:seg_hi], start)
+            start = values[seg_hi - 1]
+    return values
+
+
+def moving_average(is_purchase, qty, cost, first_event=0):
+    """Perpetual weighted average over an interleaved event stream.
+
+    `is_purchase`, `qty` and `cost` are aligned per event in time order
+    (cost is ignored for sales). Sales leave the unit cost unchanged, so
+    on-hand quantity is a cumulative sum and only the value carried from
+    one purchase to the next is a recurrence.
+
+    Returns (avg_cost, onhand) per event: the running average unit cost
+    and on-hand quantity after each event. An oversell raises ValueError
+    naming the event as `first_event` plus its index here.
+    """
+    is_purchase = np.asarray(is_purchase, dtype=bool)
+    qty = np.asarray(qty, dtype=np.float64)
+    cost = np.asarray(cost, dtype=np.float64)
+
+    onhand = np.cumsum(np.where(is_purchase, qty, -qty))
+    if len(onhand) and onhand.min() < -1e-9:
+        first = int(np.argmax(onhand < -1e-9))
+        raise ValueError(f"Sale at event {first_event + first} exceeds the quantity on hand")
+
+    purchase_idx = np.flatnonzero(is_purchase)
+    after = onhand[purchase_idx]
+    before = after - qty[purchase_idx]
+    # Share of the previous purchase's stock that survived the sales in between
+    prev_after = np.r_[0.0, after[:-1]]
+    carry = np.divide(before, prev_after, out=np.zeros_like(before), where=prev_after > 0)
+
+    values = _layer_values(carry, qty[purchase_idx] * cost[purchase_idx])
+    layer_avg = np.divide(values, after, out=np.zeros_like(values), where=after > 0)
+
+    last_purchase = np.cumsum(is_purchase) - 1
+    seen = last_purchase >= 0
+    avg_cost = np.zeros(len(qty))
+    avg_cost[seen] = layer_avg[last_purchase[seen]]
+    return avg_cost, onhand
@@ -0,0 +1,196 @@
+# accounting/multi_sku.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+METHODS = ("FIFO", "LIFO", "Weighted Average")
+SKU_COLUMNS = ["SKU", "Method", "Qty Sold", "COGS", "Ending Inventory", "Shortfall"]
+
+
+# ------------------------------
+# ✅ Vectorized valuation of a block of SKUs
+# ------------------------------
+def _value_block(sku, qty, cost, method, sale_sku, sale_qty, default_method):
+    """Periodic valuation for every SKU in one block at once.
+
+    Purchases arrive as parallel arrays (SKU code, Qty, Cost, method code)
+    in purchase order per SKU; sales as (SKU code, Qty). Method codes index
+    METHODS, with NaN where the row does not set one; a SKU takes its first
+    set method, else `default_method` (also a METHODS index). Layers are consumed
+    with per-SKU cumulative quantities, so the whole block is a handful of
+    groupby passes rather than a loop per SKU.
+
+    Returns a frame indexed by SKU code with the method code, quantity
+    sold, COGS, ending inventory and the shortfall (quantity sold beyond
+    what was purchased, which covers SKUs never purchased at all).
+    """
+    sold = pd.Series(sale_qty).groupby(sale_sku).sum()
+    methods = pd.Series(method).groupby(sku).first().fillna(default_method)
+
+    sku_sold = sold.reindex(sku, fill_value=0.0).to_numpy(dtype=np.float64)
+    sku_method = methods.reindex(sku).to_numpy()
+
+    grouped = pd.Series(qty).groupby(sku, sort=False)
+    cum_qty = grouped.cumsum().to_numpy(dtype=np.float64)
+    # Quantity ahead of each layer in the order it is consumed
+    ahead = np.where(
+        sku_method == METHODS.index("LIFO"),
+        grouped.transform("sum").to_numpy(dtype=np.float64) - cum_qty,
+        cum_qty - qty,
+    )
+    used = np.clip(sku_sold - ahead, 0.0, qty)
+
+    totals = pd.DataFrame({
+        "Qty": qty,
+        "Value": qty * cost,
+        "Layer COGS": used * cost,
+    }).groupby(sku, sort=False).sum()
+
+    # Sales of SKUs with no purchases still get a row, all shortfall
+    index = totals.index.union(sold.index)
+    totals = totals.reindex(index, fill_value=0.0)
+    result = pd.DataFrame(index=index)
+    result["Method"] = methods.reindex(index, fill_value=default_method)
+    result["Qty Sold"] = sold.reindex(index, fill_value=0.0)
+
+    avg_cost = (totals["Value"] / totals["Qty"]).where(totals["Qty"] > 0, 0.0)
+    costed = np.minimum(result["Qty Sold"], totals["Qty"])
+    is_avg = result["Method"] == METHODS.index("Weighted Average")
+    result["COGS"] = np.where(is_avg, costed * avg_cost, totals["Layer COGS"])
+    result["Ending Inventory"] = np.where(
+        is_avg,
+        (totals["Qty"] - costed) * avg_cost,
+        totals["Value"] - totals["Layer COGS"],
+    )
+    result["Shortfall"] = result["Qty Sold"] - costed
+    return result
+
+
+def _value_task(args):
+    return _value_block(*args)
+
+
+# ------------------------------
+# ✅ Cheap partitioning in the parent
+# ------------------------------
+def _sku_labels(values):
+    """SKUs as stripped strings, so 1001 (from Excel) and "1001" are one SKU."""
+    values = pd.Index(values)
+    if values.inferred_type in ("floating", "mixed-integer-float") and (values.dropna() % 1 == 0).all():
+        values = values.astype("Int64")
+    return values.astype(str).str.strip()
+
+
+def _method_codes(purchases):
+    """Per-row index into METHODS, NaN where the row falls back to the default method."""
+    if "Method" not in purchases:
+        return np.full(len(purchases), np.nan)
+    codes, uniques = pd.factorize(purchases["Method"])
+    lookup = pd.Index(METHODS).get_indexer(uniques)
+    if (lookup < 0).any():
+        unknown = sorted(map(str, uniques[lookup < 0]))
+        raise ValueError(f"Unsupported inventory method(s): {', '.join(unknown)}")
+    # factorize leaves missing methods at -1
+    return np.where(codes >= 0, lookup[codes], np.nan)
+
+
+def _sku_codes(table, name):
+    codes, uniques = pd.factorize(table["SKU"])
+    if (codes < 0).any():
+        raise ValueError(f"{int((codes < 0).sum())} {name} row(s) have no SKU")
+    return codes, _sku_labels(uniques)
+
+
+def _partition(purchases, sales, n_blocks, default_method):
+    """Split both inputs into `n_blocks` tasks by SKU code.
+
+    Each input's SKU column is factorized once (mixed int / str codes are
+    hashed as they are), then only the distinct values are normalized to
+    strings and merged, and a SKU goes to block `code % n_blocks`. The
+    parent only does these vectorized passes and a stable argsort of the
+    block numbers; grouping, sales totals and method lookups all happen
+    in the workers.
+
+    Returns (tasks, labels) where labels maps SKU codes back to SKUs.
+    """
+    for name, table, required in (("purchase", purchases, ["SKU", "Qty", "Cost"]), ("sale", sales, ["SKU", "Qty"])):
+        missing = [c for c in required if c not in table]
+        if missing:
+            raise ValueError(f"Missing {name} column(s): {', '.join(missing)}")
+
+    sku, purchase_labels = _sku_codes(purchases, "purchase")
+    sale_sku, sale_labels = _sku_codes(sales, "sale")
+    remap, labels = pd.factorize(purchase_labels.append(sale_labels))
+    sku = remap[sku]
+    sale_sku = remap[len(purchase_labels) + sale_sku]
+
+    columns = [
+        sku,
+        purchases["Qty"].to_numpy(dtype=np.float64),
+        purchases["Cost"].to_numpy(dtype=np.float64),
+        _method_codes(purchases),
+    ]
+    sale_columns = [sale_sku, sales["Qty"].to_numpy(dtype=np.float64)]
+
+    def split(block_of, arrays):
+        if n_blocks == 1:
+            return [arrays]
+        # Stable (a radix sort on int16), so each SKU's purchases keep their order
+        order = np.argsort(block_of.astype(np.int16), kind="stable")
+        bounds = np.searchsorted(block_of[order], np.arange(n_blocks + 1))
+        arrays = [a[order] for a in arrays]
+        return [[a[lo:hi] for a in arrays] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+    blocks = split(sku % n_blocks, columns)
+    sale_blocks = split(sale_sku % n_blocks, sale_columns)
+    tasks = [(*p, *s, default_method) for p, s in zip(blocks, sale_blocks) if len(p[0]) or len(s[0])]
+    return tasks, labels
+
+
+# ------------------------------
+# ✅ Parallel multi-SKU valuation
+# ------------------------------
+def value_skus(purchases, sales, method="FIFO", workers=None, blocks_per_worker=4):
+    """Value many SKUs in parallel with periodic FIFO, LIFO or weighted average.
+
+    `purchases` needs SKU, Qty and Cost columns (in purchase order per SKU)
+    and may carry a Method column to override `method` per SKU. `sales`
+    needs SKU and Qty columns. SKU codes are compared as strings. SKUs are
+    hashed into blocks and valued across a process pool; `workers=1` runs
+    in-process.
+
+    Returns (per_sku_df, totals) where totals holds company-wide COGS and
+    ending inventory plus the count of oversold SKUs (sold beyond their
+    purchases, including SKUs that were never purchased); their uncosted
+    quantity is in the per-SKU Shortfall column.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unsupported inventory method: {method}")
+    workers = workers or os.cpu_count() or 1
+    n_blocks = min(workers * blocks_per_worker, np.iinfo(np.int16).max) if workers > 1 else 1
+    tasks, labels = _partition(purchases, sales, n_blocks, METHODS.index(method))
+
+    if workers == 1 or len(tasks) <= 1:
+        parts = [_value_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_value_task, tasks))
+
+    if parts:
+        per_sku = pd.concat(parts)
+        per_sku["Method"] = np.asarray(METHODS, dtype=object)[per_sku["Method"].to_numpy(dtype=int)]
+        per_sku.insert(0, "SKU", labels[per_sku.index.to_numpy()])
+        per_sku = per_sku.sort_values("SKU", kind="stable", ignore_index=True)
+    else:
+        per_sku = pd.DataFrame(columns=SKU_COLUMNS)
+
+    totals = {
+        "SKUs": len(per_sku),
+        "COGS": float(per_sku["COGS"].sum()),
+        "Ending Inventory": float(per_sku["Ending Inventory"].sum()),
+        "Oversold SKUs": int((per_sku["Shortfall"] > 0).sum()),
+    }
+    return per_sku[SKU_COLUMNS], totals
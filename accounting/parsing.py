@@ -0,0 +1,265 @@
+# accounting/parsing.py
+
+import warnings
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+ERROR_COLUMNS = ["Line", "Error"]
+
+# Field layouts accepted per line of pasted text, keyed by field count
+PURCHASE_LAYOUTS = {2: ["Qty", "Cost"], 3: ["Date", "Qty", "Cost"]}
+SALE_LAYOUTS = {1: ["Sales Qty"], 2: ["Date", "Sales Qty"]}
+
+
+def _no_errors():
+    return pd.DataFrame({"Line": pd.Series(dtype=int), "Error": pd.Series(dtype=str)})
+
+
+def _empty(columns):
+    return pd.DataFrame({c: pd.Series(dtype=float) for c in columns}), _no_errors()
+
+
+def _lines(text):
+    """Lines of `text` split the way the C CSV reader counts them."""
+    return text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+
+
+def _split_text(text, width, line_numbers=None):
+    """Split comma-separated text into string columns plus a field count.
+
+    The C CSV reader handles the common case; if a line has more fields
+    than any layout allows, fall back to a vectorized str.split. Rows are
+    indexed by `line_numbers` (default: 1, 2, ...). Only empty fields count
+    as missing, so a literal "nan" is reported as a bad number rather than
+    as a short line.
+    """
+    names = list(range(width + 1))
+    try:
+        with warnings.catch_warnings():
+            # Raised instead of silently truncating an over-long first line
+            warnings.simplefilter("error", pd.errors.ParserWarning)
+            raw = pd.read_csv(
+                StringIO(text), header=None, names=names, dtype=str, index_col=False,
+                skipinitialspace=True, skip_blank_lines=False, keep_default_na=False, na_values=[""],
+            )
+    except (pd.errors.ParserError, pd.errors.ParserWarning):
+        raw = pd.Series(_lines(text), dtype=str).str.split(",", expand=True)
+        raw = raw.apply(lambda col: col.str.strip())
+        raw = raw.replace("", np.nan)
+    raw.index = np.arange(1, len(raw) + 1) if line_numbers is None else line_numbers
+    raw = raw.dropna(how="all")
+    return raw, raw.notna().sum(axis=1).to_numpy()
+
+
+def _read_uniform(text, columns):
+    """Typed read for text whose lines (mostly) share one layout.
+
+    Returns (table, failed): the rows that parsed cleanly, indexed by line
+    number, and the line numbers that need the row-by-row checks in
+    _parse_lines (bad or missing values, an extra field, a non-ISO date).
+    Returns None when the reader cannot split the text at all.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", pd.errors.ParserWarning)
+            # A stray token leaves a column with mixed types; handled below
+            warnings.simplefilter("ignore", pd.errors.DtypeWarning)
+            table = pd.read_csv(
+                StringIO(text), header=None, names=columns + ["_extra"], index_col=False,
+                dtype={"Date": str, "_extra": object}, skipinitialspace=True, skip_blank_lines=False,
+                keep_default_na=False, na_values=[""],
+            )
+    except (pd.errors.ParserError, pd.errors.ParserWarning):
+        return None
+
+    # Blank lines are skipped; anything else that does not fit is re-checked
+    failed = table["_extra"].notna().to_numpy(copy=True)
+    blank = ~failed
+    fields = {}
+    for column in columns:
+        values = table[column]
+        blank &= values.isna().to_numpy()
+        if column == "Date":
+            dates = pd.to_datetime(values, errors="coerce", format="ISO8601")
+            failed |= dates.isna().to_numpy()
+            fields[column] = dates.to_numpy()
+            continue
+        if not pd.api.types.is_numeric_dtype(values):
+            values = pd.to_numeric(values, errors="coerce")
+        values = values.to_numpy(dtype=np.float64)
+        failed |= ~np.isfinite(values) | (values < 0)
+        fields[column] = values
+
+    failed &= ~blank
+    keep = ~(failed | blank)
+    failed_lines = np.flatnonzero(failed) + 1
+    if keep.all():
+        return pd.DataFrame(fields, index=pd.RangeIndex(1, len(table) + 1)), failed_lines
+    fields = {c: v[keep] for c, v in fields.items()}
+    return pd.DataFrame(fields, index=np.flatnonzero(keep) + 1), failed_lines
+
+
+def _parse_lines(text, layouts, line_numbers=None):
+    """Row-by-row checks: map each line onto its layout and type it."""
+    width = max(layouts)
+    raw, n_fields = _split_text(text, width, line_numbers)
+
+    fields = {}
+    errors = [pd.DataFrame({
+        "Line": raw.index[~np.isin(n_fields, list(layouts))],
+        "Error": f"expected {' or '.join(map(str, sorted(layouts)))} comma-separated values",
+    })]
+    # Map each line's fields onto the layout matching its field count
+    for count, columns in layouts.items():
+        match = n_fields == count
+        for offset, column in enumerate(columns):
+            values = raw.iloc[:, offset].where(match)
+            fields[column] = values if column not in fields else fields[column].fillna(values)
+
+    table = pd.DataFrame(fields, index=raw.index)[layouts[width]]
+    ok = np.isin(n_fields, list(layouts))
+    return _coerce(table[ok], errors)
+
+
+def _from_text(text, layouts):
+    first_line = next((line for line in text.splitlines() if line.strip()), None)
+    if first_line is None:
+        return _empty(layouts[min(layouts)])
+    columns = layouts.get(first_line.count(",") + 1)
+    uniform = _read_uniform(text, columns) if columns else None
+    if uniform is None:
+        return _finish(*_parse_lines(text, layouts))
+
+    table, failed = uniform
+    if not len(failed):
+        return table.reset_index(drop=True), _no_errors()
+
+    # Only the lines the typed read rejected go through the row-by-row checks
+    lines = _lines(text)
+    fixed, errors = _parse_lines("\n".join(lines[i - 1] for i in failed), layouts, failed)
+    if len(fixed):
+        table = pd.concat([table, fixed]).sort_index(kind="stable")
+        table = table[[c for c in layouts[max(layouts)] if c in table]]
+    return _finish(table, errors)
+
+
+def _coerce(table, errors):
+    """Type the Date/Qty/Cost columns, moving bad rows into `errors`.
+
+    Returns the good rows (still indexed by line number) and the list of
+    error frames; _finish turns them into the parser's return value.
+    """
+    bad = pd.Series(False, index=table.index)
+
+    for column in [c for c in ("Qty", "Sales Qty", "Cost") if c in table]:
+        values = pd.to_numeric(table[column], errors="coerce").astype(float)
+        invalid = ~np.isfinite(values) | (values < 0)
+        errors.append(pd.DataFrame({
+            "Line": table.index[invalid & ~bad],
+            "Error": f"{column} must be a non-negative number",
+        }))
+        bad |= invalid
+        table[column] = values
+
+    if "Date" in table:
+        dates = pd.to_datetime(table["Date"], errors="coerce", format="mixed")
+        invalid = dates.isna() & table["Date"].notna()
+        errors.append(pd.DataFrame({
+            "Line": table.index[invalid & ~bad],
+            "Error": "Date is not a valid date",
+        }))
+        bad |= invalid
+        table["Date"] = dates
+
+    return table[~bad.to_numpy()], errors
+
+
+def _finish(table, errors):
+    table = table.reset_index(drop=True)
+    if "Date" in table and table["Date"].isna().all():
+        table = table.drop(columns="Date")
+
+    errors = pd.concat(errors, ignore_index=True).sort_values("Line", kind="stable")
+    return table, errors.reset_index(drop=True)[ERROR_COLUMNS]
+
+
+# ------------------------------
+# ✅ Pasted text
+# ------------------------------
+def parse_purchases(text):
+    """Parse `Qty, Cost` or `Date, Qty, Cost` lines.
+
+    Returns (purchases_df, errors_df); malformed lines are reported in
+    errors_df by line number instead of raising.
+    """
+    return _from_text(text, PURCHASE_LAYOUTS)
+
+
+def parse_sales(text):
+    """Parse `Qty` or `Date, Qty` lines; returns (sales_df, errors_df)."""
+    return _from_text(text, SALE_LAYOUTS)
+
+
+# ------------------------------
+# ✅ Uploaded CSV / Excel files
+# ------------------------------
+def _from_table(table, columns, aliases, first_line):
+    table = table.rename(columns=lambda c: str(c).strip()).rename(columns=aliases)
+    missing = [c for c in columns if c not in table]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    keep = (["Date"] if "Date" in table else []) + columns
+    table = table[keep]
+    table.index = np.arange(first_line, len(table) + first_line)
+    return _finish(*_coerce(table, []))
+
+
+def _read_file(uploaded_file, columns, aliases):
+    if uploaded_file.name.endswith(".csv"):
+        table = pd.read_csv(uploaded_file)
+    elif uploaded_file.name.endswith(".xlsx"):
+        table = pd.read_excel(uploaded_file)
+    else:
+        raise ValueError("Unsupported file type.")
+    # Line numbers as seen in the file, after the header row
+    return _from_table(table, columns, aliases, first_line=2)
+
+
+def read_purchases(uploaded_file):
+    """Read purchases from a .csv/.xlsx with Qty, Cost and optional Date columns."""
+    return _read_file(uploaded_file, ["Qty", "Cost"], {})
+
+
+def read_sales(uploaded_file):
+    """Read sales from a .csv/.xlsx with a Qty (or Sales Qty) and optional Date column."""
+    return _read_file(uploaded_file, ["Sales Qty"], {"Qty": "Sales Qty"})
+
+
+# ------------------------------
+# ✅ JSON records
+# ------------------------------
+def purchases_from_records(records):
+    """Purchases from a list of {"Qty", "Cost", optional "Date"} dicts; lines count from 1."""
+    if not len(records):
+        return _empty(["Qty", "Cost"])
+    return _from_table(pd.DataFrame(records), ["Qty", "Cost"], {}, first_line=1)
+
+
+def sales_from_records(records):
+    """Sales from a list of {"Qty" (or "Sales Qty"), optional "Date"} dicts; lines count from 1."""
+    if not len(records):
+        return _empty(["Sales Qty"])
+    return _from_table(pd.DataFrame(records), ["Sales Qty"], {"Qty": "Sales Qty"}, first_line=1)
+
+
+def load_purchases(uploaded_file, text):
+    """Purchases from the uploaded file when there is one, else from the pasted text."""
+    return read_purchases(uploaded_file) if uploaded_file else parse_purchases(text)
+
+
+def load_sales(uploaded_file, text):
+    """Sales from the uploaded file when there is one, else from the pasted text."""
+    return read_sales(uploaded_file) if uploaded_file else parse_sales(text)
@@ -0,0 +1,390 @@
+# accounting/service.py
+"""Local HTTP service for the accounting engines behind the Streamlit pages.
+
+    python -m accounting.service [--host 127.0.0.1] [--port 8765] [--workers 4]
+
+POST one JSON job to an endpoint, or a JSON list of jobs to run them as a
+batch. Jobs run on a bounded worker pool and share one StageGraph, so a
+repeated job (or a job that shares its inputs with an earlier one) is
+served from the cache.
+
+    POST /statements    {"trial_balance": [{"Account", "Type", "Amount"}, ...]}
+    POST /cycle         {"journal": [{"Date", "Account", "Debit", "Credit"}, ...]}
+    POST /depreciation  {"method", "cost", "salvage", "useful_life",
+                         "total_units", "units_per_year"}
+    POST /inventory     {"purchases", "sales", "method", "system", "as_of"}
+    GET  /health
+
+Inventory purchases and sales are either text in the page's line format
+or lists of {"Date", "Qty", "Cost"} / {"Date", "Qty"} records. Responses
+are JSON ({"totals", "tables"}, or {"results": [...]} for a batch); add
+?format=csv&table=<name> to get one table as CSV instead.
+"""
+
+import argparse
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from accounting.depreciation import depreciation_schedule
+from accounting.graph import Node, StageGraph, fingerprint
+from accounting.multi_sku import METHODS
+from accounting.parsing import (
+    parse_purchases, parse_sales, purchases_from_records, sales_from_records,
+)
+from accounting.statements import (
+    adjusted_trial_balance, cycle_statements, financial_statements, ledger_balances,
+)
+from accounting.valuation import is_dated, value_as_of, valuation_index, value_inventory
+
+logger = logging.getLogger("accounting.service")
+
+SYSTEMS = ["Periodic", "Perpetual"]
+JOB_TIMEOUT = 120
+
+
+def _frame(payload, key):
+    records = payload[key]
+    if not isinstance(records, list):
+        raise ValueError(f"'{key}' must be a list of records")
+    return pd.DataFrame(records)
+
+
+def _load_purchases(value):
+    return parse_purchases(value) if isinstance(value, str) else purchases_from_records(value)
+
+
+def _load_sales(value):
+    return parse_sales(value) if isinstance(value, str) else sales_from_records(value)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _records(table):
+    return json.loads(table.to_json(orient="records", date_format="iso"))
+
+
+def encode_json(result):
+    tables, totals = result
+    return json.dumps(
+        {"totals": totals, "tables": {name: _records(table) for name, table in tables.items()}},
+        default=_json_default
+    )
+
+
+def _pick_table(result, table):
+    tables, _ = result
+    name = table or next(iter(tables))
+    if name not in tables:
+        raise ValueError(f"Unknown table '{name}'; expected one of: {', '.join(tables)}")
+    return tables[name]
+
+
+def encode_csv(result, table):
+    return _pick_table(result, table).to_csv(index=False)
+
+
+# ------------------------------
+# ✅ Jobs and the worker pool
+# ------------------------------
+class Service:
+    """Runs endpoint jobs on a bounded thread pool over a shared StageGraph.
+
+    At most `workers` jobs run at once and at most `max_pending` are
+    accepted (running or queued); past that, requests get a 503 instead
+    of piling up. Each job returns (tables, totals): named DataFrames plus
+    the headline figures.
+    """
+
+    def __init__(self, workers=4, max_pending=None, cache_size=256, cache_mb=512):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 8
+        self.graph = StageGraph(cache_size, cache_mb * 2**20)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="accounting-job")
+        self.jobs = {
+            "statements": self.statements,
+            "cycle": self.cycle,
+            "depreciation": self.depreciation,
+            "inventory": self.inventory,
+        }
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    # ✅ Endpoint jobs
+    def statements(self, payload):
+        tb = _frame(payload, "trial_balance")
+        income_statement, balance_sheet, cash_flow, totals = self.graph.node(
+            "statement build", financial_statements, tb
+        ).value
+        tables = {"income_statement": income_statement, "balance_sheet": balance_sheet, "cash_flow": cash_flow}
+        return tables, totals
+
+    def cycle(self, payload):
+        ledger = self.graph.node("ledger groupby", ledger_balances, _frame(payload, "journal"))
+        atb = self.graph.node("adjusted trial balance", adjusted_trial_balance, ledger)
+        income_statement, balance_sheet, totals = self.graph.node("statement build", cycle_statements, atb).value
+        tables = {
+            "ledger": ledger.value,
+            "adjusted_trial_balance": atb.value,
+            "income_statement": income_statement,
+            "balance_sheet": balance_sheet,
+        }
+        return tables, totals
+
+    def depreciation(self, payload):
+        if int(payload["useful_life"]) < 1:
+            raise ValueError("'useful_life' must be at least 1 year")
+        schedule = self.graph.node(
+            "depreciation schedule", depreciation_schedule,
+            payload["method"], float(payload["cost"]), float(payload.get("salvage", 0)),
+            int(payload["useful_life"]), payload.get("total_units"), list(payload.get("units_per_year", []))
+        ).value
+        return {"schedule": schedule}, {"Total Depreciation": schedule["Depreciation"].sum()}
+
+    def inventory(self, payload):
+        method = payload.get("method", "FIFO")
+        system = payload.get("system", "Periodic")
+        if method not in METHODS:
+            raise ValueError(f"Unknown inventory method '{method}'; expected one of: {', '.join(METHODS)}")
+        if system not in SYSTEMS:
+            raise ValueError(f"Unknown inventory system '{system}'; expected one of: {', '.join(SYSTEMS)}")
+
+        purchases, purchase_errors = self.graph.node("parse purchases", _load_purchases, payload["purchases"]).split()
+        sales, sale_errors = self.graph.node("parse sales", _load_sales, payload["sales"]).split()
+        cogs, ending_inv, flow, events, shortfall = self.graph.node(
+            "inventory engine", value_inventory, purchases, sales, method, system
+        ).split()
+
+        tables = {
+            "flow": flow.value if system == "Periodic" else flow.value.to_frame(),
+            "purchase_errors": purchase_errors.value,
+            "sale_errors": sale_errors.value,
+        }
+        as_of = payload.get("as_of") or []
+        if as_of:
+            if system != "Perpetual" or not is_dated(purchases.value, sales.value):
+                raise ValueError("'as_of' needs the Perpetual system and a Date on every purchase and sale")
+            dates = pd.to_datetime(pd.Series(as_of), errors="coerce", format="mixed")
+            if dates.isna().any():
+                raise ValueError(f"Invalid as-of date(s): {', '.join(map(str, pd.Series(as_of)[dates.isna()]))}")
+            index = self.graph.node("as-of index", valuation_index, events, method)
+            tables["as_of"] = self.graph.node("as-of valuation", value_as_of, index, dates).value
+
+        totals = {
+            "Method": method, "System": system, "COGS": cogs.value, "Ending Inventory": ending_inv.value,
+            "Shortfall": shortfall.value,
+        }
+        return tables, totals
+
+    # ✅ Scheduling
+    def _reserve(self, n):
+        with self._lock:
+            if self._pending + n > self.max_pending:
+                return False
+            self._pending += n
+            return True
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, endpoint, raw, payload):
+        """One job, memoized on its raw JSON so repeats skip parsing and compute."""
+        if not isinstance(payload, dict):
+            raise ValueError("Each job must be a JSON object")
+        request = Node("request", fingerprint(raw), payload)
+        return self.graph.node(endpoint, self.jobs[endpoint], request)
+
+    def submit(self, endpoint, items):
+        """Queue (raw bytes, payload) jobs; None when the pool is full."""
+        if not self._reserve(len(items)):
+            return None
+        futures = []
+        for raw, payload in items:
+            future = self.pool.submit(self._run, endpoint, raw, payload)
+            future.add_done_callback(self._release)
+            futures.append(future)
+        return futures
+
+    def health(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "pending": pending,
+            "max_pending": self.max_pending,
+            "cache": {
+                "entries": len(self.graph), "mb": round(self.graph.nbytes / 2**20, 1),
+                "hits": self.graph.hits, "misses": self.graph.misses,
+            },
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _error_message(error):
+    if isinstance(error, KeyError):
+        return f"Missing field: {error.args[0]}"
+    return str(error)
+
+
+# ------------------------------
+# ✅ HTTP front end
+# ------------------------------
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AccountingLab/1.0"
+    # Keep-alive, so batch clients and the load test reuse connections
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def _send(self, status, body, content_type="application/json", headers=()):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status, message):
+        self._send(status, json.dumps({"error": message}))
+
+    def do_GET(self):
+        if urlparse(self.path).path.rstrip("/") == "/health":
+            self._send(200, json.dumps(self.service.health()))
+        else:
+            self._send_error(404, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        endpoint = url.path.strip("/")
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if endpoint not in self.service.jobs:
+            return self._send_error(404, f"Unknown endpoint /{endpoint}; expected one of: "
+                                         + ", ".join(f"/{name}" for name in self.service.jobs))
+
+        query = parse_qs(url.query)
+        fmt = query.get("format", ["json"])[0]
+        table = query.get("table", [None])[0]
+        if fmt not in ("json", "csv"):
+            return self._send_error(400, f"Unknown format '{fmt}'; expected json or csv")
+
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            return self._send_error(400, f"Invalid JSON: {e}")
+
+        batch = isinstance(payload, list)
+        if batch:
+            if len(payload) > self.service.max_pending:
+                return self._send_error(413, f"Batch of {len(payload)} jobs exceeds the limit of {self.service.max_pending}")
+            items = [(json.dumps(item, sort_keys=True).encode("utf-8"), item) for item in payload]
+        else:
+            items = [(body, payload)]
+
+        futures = self.service.submit(endpoint, items)
+        if futures is None:
+            return self._send_error(503, "Worker pool is full; retry shortly")
+
+        results = []
+        for future in futures:
+            try:
+                results.append((future.result(timeout=JOB_TIMEOUT), None))
+            except (KeyError, TypeError, ValueError) as e:
+                results.append((None, _error_message(e)))
+            except Exception as e:
+                logger.exception("/%s job failed", endpoint)
+                results.append((None, f"Internal error: {e}"))
+
+        try:
+            if fmt == "csv":
+                return self._send_csv(results, batch, table)
+            return self._send_json(results, batch)
+        except ValueError as e:
+            return self._send_error(400, str(e))
+
+    def _send_json(self, results, batch):
+        graph = self.service.graph
+        parts = [
+            graph.node("encode json", encode_json, node).value if error is None else json.dumps({"error": error})
+            for node, error in results
+        ]
+        if batch:
+            return self._send(200, '{"results": [' + ", ".join(parts) + "]}")
+        status = 200 if results[0][1] is None else 400
+        return self._send(status, parts[0])
+
+    def _send_csv(self, results, batch, table):
+        graph = self.service.graph
+        if not batch:
+            node, error = results[0]
+            if error is not None:
+                return self._send_error(400, error)
+            return self._send(200, graph.node("encode csv", encode_csv, node, table).value, "text/csv")
+
+        frames = [
+            _pick_table(node.value, table).assign(Request=i)
+            for i, (node, error) in enumerate(results) if error is None
+        ]
+        errors = {i: error for i, (_, error) in enumerate(results) if error is not None}
+        csv = pd.concat(frames, ignore_index=True).to_csv(index=False) if frames else ""
+        headers = [("X-Batch-Errors", json.dumps(errors))] if errors else []
+        return self._send(200, csv, "text/csv", headers)
+
+
+def make_server(host="127.0.0.1", port=8765, workers=4, max_pending=None, cache_size=256, cache_mb=512):
+    """A ThreadingHTTPServer bound to (host, port) with its Service attached."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = Service(workers, max_pending, cache_size, cache_mb)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the accounting engines over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4, help="jobs computed at once")
+    parser.add_argument("--max-pending", type=int, default=None, help="jobs accepted before 503s (default 8 x workers)")
+    parser.add_argument("--cache-size", type=int, default=256, help="StageGraph entries kept")
+    parser.add_argument("--cache-mb", type=int, default=512, help="approximate StageGraph memory kept, in MB")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    server = make_server(args.host, args.port, args.workers, args.max_pending, args.cache_size, args.cache_mb)
+    logger.info("Serving on http://%s:%d with %d workers", args.host, server.server_port, args.workers)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# accounting/statements.py
+
+import pandas as pd
+
+TRIAL_BALANCE_COLUMNS = ["Account", "Type", "Amount"]
+JOURNAL_COLUMNS = ["Date", "Account", "Debit", "Credit"]
+
+
+def _require(table, columns):
+    missing = [c for c in columns if c not in table]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+
+# ------------------------------
+# ✅ Financial statements from a trial balance
+# ------------------------------
+def financial_statements(tb):
+    """Income statement, balance sheet and indirect cash flow for a trial balance.
+
+    Returns (income_statement, balance_sheet, cash_flow, totals), where
+    totals holds the headline figures the page prints and charts.
+    """
+    _require(tb, TRIAL_BALANCE_COLUMNS)
+
+    revenues = tb[tb["Type"] == "Revenue"]
+    expenses = tb[tb["Type"] == "Expense"]
+
+    total_revenue = revenues["Amount"].sum()
+    total_expenses = expenses["Amount"].sum()
+    net_income = total_revenue - total_expenses
+
+    income_statement = pd.concat([
+        pd.DataFrame({"Description": revenues["Account"], "Amount": revenues["Amount"]}),
+        pd.DataFrame({"Description": expenses["Account"], "Amount": -expenses["Amount"]})
+    ])
+
+    income_statement.loc["Total Revenue"] = ["Total Revenue", total_revenue]
+    income_statement.loc["Total Expenses"] = ["Total Expenses", -total_expenses]
+    income_statement.loc["Net Income"] = ["Net Income", net_income]
+    income_statement = income_statement.reset_index(drop=True)
+
+    assets_df = tb[tb["Type"] == "Asset"]
+    liabilities_df = tb[tb["Type"] == "Liability"]
+    equity_df = tb[tb["Type"] == "Equity"]
+
+    # Add Net Income to Equity
+    equity_df = pd.concat([
+        equity_df,
+        pd.DataFrame({"Account": ["Net Income"], "Amount": [net_income]})
+    ])
+
+    total_assets = assets_df["Amount"].sum()
+    total_liabilities = liabilities_df["Amount"].sum()
+    total_equity = equity_df["Amount"].sum()
+
+    balance_sheet = pd.concat([
+        pd.DataFrame({"Section": "Assets", "Account": assets_df["Account"], "Amount": assets_df["Amount"]}),
+        pd.DataFrame({"Section": "Liabilities", "Account": liabilities_df["Account"], "Amount": liabilities_df["Amount"]}),
+        pd.DataFrame({"Section": "Equity", "Account": equity_df["Account"], "Amount": equity_df["Amount"]})
+    ]).reset_index(drop=True)
+
+    non_cash_expenses = tb[tb["Type"] == "Non-Cash"]["Amount"].sum()
+    changes_in_assets = -total_assets
+    changes_in_liabilities = total_liabilities
+    net_cash_from_ops = net_income + non_cash_expenses + changes_in_assets + changes_in_liabilities
+
+    cash_flow = pd.DataFrame({
+        "Item": ["Net Income", "Non-Cash Expenses", "Changes in Assets", "Changes in Liabilities", "Net Cash from Ops"],
+        "Amount": [net_income, non_cash_expenses, changes_in_assets, changes_in_liabilities, net_cash_from_ops]
+    })
+
+    totals = {
+        "Total Revenue": total_revenue,
+        "Total Expenses": total_expenses,
+        "Net Income": net_income,
+        "Total Assets": total_assets,
+        "Total Liabilities": total_liabilities,
+        "Total Equity": total_equity,
+        "Net Cash from Ops": net_cash_from_ops,
+        "Balanced": bool(abs(total_assets - (total_liabilities + total_equity)) < 1e-2),
+    }
+    return income_statement, balance_sheet, cash_flow, totals
+
+
+# ------------------------------
+# ✅ Accounting cycle from journal entries
+# ------------------------------
+def ledger_balances(journal):
+    """Debit, credit and balance per account."""
+    _require(journal, ["Account", "Debit", "Credit"])
+    ledger = journal.groupby("Account").agg({"Debit": "sum", "Credit": "sum"}).reset_index()
+    ledger["Balance"] = ledger["Debit"] - ledger["Credit"]
+    return ledger
+
+
+def adjusted_trial_balance(ledger):
+    """Each ledger balance on its DR or CR side."""
+    atb = ledger[["Account"]].copy()
+    atb["DR"] = ledger["Balance"].clip(lower=0)
+    atb["CR"] = (-ledger["Balance"]).clip(lower=0)
+    return atb
+
+
+def cycle_statements(atb):
+    """Income statement and balance sheet summaries from an adjusted trial balance.
+
+    Returns (income_statement, balance_sheet, totals).
+    """
+    revenue_accounts = ["Revenue"]
+    expense_accounts = ["Rent Expense", "Supplies Expense"]
+    supplies_row = atb[atb["Account"] == "Supplies"]
+    if not supplies_row.empty:
+        supplies_used = supplies_row["DR"].values[0]
+        if supplies_used > 0:
+            expense_accounts.append("Supplies")
+
+    total_revenue = atb[atb["Account"].isin(revenue_accounts)]["CR"].sum()
+    total_expenses = atb[atb["Account"].isin(expense_accounts)]["DR"].sum()
+    net_income = total_revenue - total_expenses
+
+    income_statement = pd.DataFrame([
+        ["Total Revenue", total_revenue],
+        ["Total Expenses", total_expenses],
+        ["Net Income", net_income]
+    ], columns=["Description", "Amount"])
+
+    assets = ["Cash", "Supplies"]
+    liabilities = ["Accounts Payable"]
+    equity = ["Owner's Capital"]
+
+    total_assets = atb[atb["Account"].isin(assets)]["DR"].sum()
+    total_liabilities = atb[atb["Account"].isin(liabilities)]["CR"].sum()
+    total_equity = atb[atb["Account"].isin(equity)]["CR"].sum() + net_income
+
+    balance_sheet = pd.DataFrame([
+        ["Total Assets", total_assets],
+        ["Total Liabilities", total_liabilities],
+        ["Owner's Equity", total_equity],
+        ["Liabilities + Equity", total_liabilities + total_equity]
+    ], columns=["Description", "Amount"])
+
+    totals = {
+        "Total Revenue": total_revenue,
+        "Total Expenses": total_expenses,
+        "Net Income": net_income,
+        "Total Assets": total_assets,
+        "Total Liabilities": total_liabilities,
+        "Total Equity": total_equity,
+    }
+    return income_statement, balance_sheet, totals
@@ -0,0 +1,152 @@
+# accounting/store.py
+
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+
+def flow_dtype(time_dtype="i8"):
+    """Row layout of a FIFO / LIFO flow step: one layer drawn by a sale."""
+    return np.dtype([
+        ("Time", time_dtype),
+        ("Sale Qty", "f8"),
+        ("Cost", "f8"),
+        ("Total Cost", "f8"),
+    ])
+
+
+def average_flow_dtype(time_dtype="i8"):
+    """Row layout of a moving-average flow step: one sale at the running average cost."""
+    return np.dtype([
+        ("Time", time_dtype),
+        ("Sale Qty", "f8"),
+        ("Avg Cost", "f8"),
+        ("COGS for Sale", "f8"),
+    ])
+
+
+# ------------------------------
+# ✅ Append-only table on a structured array
+# ------------------------------
+class RecordStore:
+    """Append-only rows kept in one preallocated structured NumPy array.
+
+    Each row costs only its packed field width (32 bytes for a flow step)
+    instead of a dict per row, and capacity doubles when full so appends
+    stay amortized O(1).
+    """
+
+    __slots__ = ("_data", "_size")
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(max(int(capacity), 1), dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @classmethod
+    def from_columns(cls, dtype, columns):
+        """Build a full store from equal-length arrays keyed by field name."""
+        size = len(next(iter(columns.values()))) if columns else 0
+        store = cls(dtype, capacity=size)
+        for name, values in columns.items():
+            store._data[name][:size] = values
+        store._size = size
+        return store
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+    def append(self, row):
+        self._reserve(1)
+        self._data[self._size] = row
+        self._size += 1
+
+    def extend(self, rows, chunk_size=65_536):
+        """Append an iterable of row tuples (e.g. PerpetualLayers.run), a chunk at a time."""
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            self._reserve(len(chunk))
+            self._data[self._size:self._size + len(chunk)] = chunk
+            self._size += len(chunk)
+
+    @property
+    def columns(self):
+        return list(self._data.dtype.names)
+
+    @property
+    def rows(self):
+        """Read-only view of the filled rows; no copy is made."""
+        view = self._data[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def column(self, name):
+        return self.rows[name]
+
+    def to_frame(self):
+        return pd.DataFrame({name: self.column(name) for name in self.columns})
+
+
+# ------------------------------
+# ✅ Purchase layers on parallel arrays
+# ------------------------------
+class LayerStore:
+    """Remaining quantity and unit cost per purchase layer.
+
+    Layers sit in parallel float64 arrays between a head and a tail index:
+    purchases push at the tail, FIFO draws from the head and LIFO from the
+    tail. Consumed head slots are reclaimed when the arrays need to grow.
+    """
+
+    __slots__ = ("qty", "cost", "head", "tail")
+
+    def __init__(self, capacity=1024):
+        capacity = max(int(capacity), 1)
+        self.qty = np.empty(capacity)
+        self.cost = np.empty(capacity)
+        self.head = 0
+        self.tail = 0
+
+    def __len__(self):
+        return self.tail - self.head
+
+    @classmethod
+    def from_arrays(cls, qty, cost):
+        store = cls(capacity=len(qty))
+        store.qty[:len(qty)] = qty
+        store.cost[:len(cost)] = cost
+        store.tail = len(qty)
+        return store
+
+    @property
+    def live(self):
+        """(qty, cost) copies of the layers still on hand, oldest first."""
+        return self.qty[self.head:self.tail].copy(), self.cost[self.head:self.tail].copy()
+
+    def push(self, qty, cost):
+        if self.tail == len(self.qty):
+            live = self.tail - self.head
+            size = max(2 * live, len(self.qty)) if self.head else 2 * len(self.qty)
+            for name in ("qty", "cost"):
+                grown = np.empty(max(size, 1))
+                grown[:live] = getattr(self, name)[self.head:self.tail]
+                setattr(self, name, grown)
+            self.head, self.tail = 0, live
+        self.qty[self.tail] = qty
+        self.cost[self.tail] = cost
+        self.tail += 1
+
+    @property
+    def value(self):
+        live = slice(self.head, self.tail)
+        return float(np.dot(self.qty[live], self.cost[live]))
@@ -0,0 +1,149 @@
+# accounting/theme.py
+
+import streamlit as st
+
+# ------------------------------
+# ✅ Shared CSS, one block per concern
+# ------------------------------
+BASE = """
+body {
+    background-color: #e6defd;
+}
+[data-testid="stSidebar"] {
+    background: linear-gradient(135deg, #8c7773 0%, #f2eefe 100%);
+}
+/* Main content area: white */
+.stApp {
+    background-color: #ffffff;
+}
+/* Main text: dark brown */
+.stApp, .stApp * {
+    color: #533d38;
+}
+"""
+
+METRICS = """
+div[data-testid="metric-container"] {
+    background: rgba(93, 64, 55, 0.05);
+    border-radius: 8px;
+    padding: 10px;
+}
+"""
+
+HERO = """
+.hero {
+    background-color: white;
+    padding: 40px;
+    border-radius: 15px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.1);
+    max-width: 600px;
+    margin: 50px auto;
+    text-align: center;
+    font-size: 18px;
+}
+"""
+
+BUTTONS = """
+div.stButton > button {
+    background-color: #8c7773;
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 0.5em 1em;
+}
+div.stButton > button:hover {
+    background-color: #735c58;
+}
+"""
+
+TEXT_INPUTS = """
+textarea {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+div[data-baseweb="select"] > div {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+div[data-baseweb="select"] span {
+    color: white !important;
+}
+section[data-testid="stTextArea"] textarea {
+    background-color: #8c7773 !important;
+    color: #ffffff !important;
+}
+section[data-testid="stTextArea"] textarea::placeholder {
+    color: #ffffff !important;
+}
+div[data-baseweb="select"] input {
+    color: #ffffff !important;
+}
+"""
+
+FORM_FIELDS = """
+/* Inputs, text areas, select boxes — white text & dark background */
+input, textarea, select {
+    color: #ffffff !important;
+    background-color: #8c7773 !important;
+}
+.stTextInput > div > input,
+.stSelectbox > div > div > div {
+    color: #ffffff !important;
+    background-color: #8c7773 !important;
+}
+::placeholder {
+    color: #dddddd !important;
+    opacity: 1;
+}
+"""
+
+DATA_EDITOR = """
+[data-testid="stDataEditorContainer"] {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+[data-testid="stDataEditorContainer"] .cell {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+[data-testid="stDataEditorContainer"] .col-header {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+[data-testid="stDataEditorContainer"] input {
+    background-color: #8c7773 !important;
+    color: white !important;
+}
+"""
+
+FILE_UPLOADER = """
+section[data-testid="stFileUploader"] {
+    background-color: #8c7773 !important;
+    border-radius: 8px;
+    padding: 1rem;
+    color: #ffffff !important;
+}
+section[data-testid="stFileUploader"] label {
+    color: #ffffff !important;
+}
+section[data-testid="stFileUploader"] button {
+    background-color: #ffffff !important;
+    color: #8c7773 !important;
+    border: none;
+    border-radius: 6px;
+    padding: 0.5em 1em;
+}
+section[data-testid="stFileUploader"] button:hover {
+    background-color: #f2eefe !important;
+    color: #8c7773 !important;
+}
+section[data-testid="stFileUploader"] div {
+    color: #ffffff !important;
+}
+"""
+
+
+def apply_theme(*sections):
+    """Inject BASE plus the given sections as a single <style> block."""
+    css = "".join((BASE,) + sections)
+    st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
@@ -0,0 +1,89 @@
+# accounting/valuation.py
+
+import pandas as pd
+
+from accounting.asof import ValuationIndex
+from accounting.checkpoint import LayerState, advance
+from accounting.inventory import event_table, periodic_layers
+
+
+def is_dated(purchases, sales):
+    """True when every purchase and sale carries a Date."""
+    return bool(
+        "Date" in purchases and "Date" in sales
+        and purchases["Date"].notna().all() and sales["Date"].notna().all()
+    )
+
+
+def event_streams(purchases, sales):
+    """Purchase and sale streams in time order for the perpetual engines.
+
+    Dated inputs are interleaved by date; otherwise every purchase precedes
+    the sales, which keep their input order.
+    """
+    if is_dated(purchases, sales):
+        purchase_stream = purchases.sort_values("Date", kind="stable")[["Date", "Qty", "Cost"]]
+        sale_stream = sales.sort_values("Date", kind="stable")[["Date", "Sales Qty"]]
+    else:
+        purchase_stream = purchases.assign(Date=0)[["Date", "Qty", "Cost"]]
+        sale_stream = sales.assign(Date=range(1, len(sales) + 1))[["Date", "Sales Qty"]]
+    return purchase_stream, sale_stream
+
+
+def perpetual_events(purchases, sales):
+    """The event_table the perpetual engines replay."""
+    return event_table(*event_streams(purchases, sales))
+
+
+def value_inventory(purchases, sales, method, system):
+    """COGS and ending inventory for one item.
+
+    Returns (cogs, ending_inv, flow, events, shortfall): flow is a
+    RecordStore for the perpetual engines and a DataFrame for periodic ones;
+    events is the perpetual event_table (None for periodic); shortfall is
+    the quantity sold beyond what was on hand. FIFO / LIFO leave it
+    uncosted; perpetual weighted average raises on a shortfall instead.
+    """
+    if system == "Periodic":
+        total_sales = float(sales["Sales Qty"].sum())
+        shortfall = max(total_sales - float(purchases["Qty"].sum()), 0.0)
+
+        if method in ["FIFO", "LIFO"]:
+            cogs, ending_inv, flow, _ = periodic_layers(
+                purchases["Qty"].to_numpy(), purchases["Cost"].to_numpy(), total_sales, method
+            )
+
+        elif method == "Weighted Average":
+            total_qty = purchases["Qty"].sum()
+            total_cost = (purchases["Qty"] * purchases["Cost"]).sum()
+            avg_cost = total_cost / total_qty if total_qty else 0
+            cogs = total_sales * avg_cost
+            ending_inv = (total_qty - total_sales) * avg_cost
+            flow = pd.DataFrame([{
+                "Total Qty": total_qty,
+                "Avg Cost": avg_cost,
+                "Qty Sold": total_sales,
+                "COGS": cogs,
+                "Ending Inventory": ending_inv
+            }])
+
+        else:
+            raise ValueError(f"Unsupported inventory method: {method}")
+        return cogs, ending_inv, flow, None, shortfall
+
+    if system == "Perpetual":
+        events = perpetual_events(purchases, sales)
+        state, flow = advance(LayerState(method), events)
+        return state.cogs, state.ending_inventory, flow, events, state.shortfall
+
+    raise ValueError(f"Unsupported inventory system: {system}")
+
+
+def valuation_index(events, method):
+    """Snapshot index over a perpetual event_table; build once, query often."""
+    return ValuationIndex(events, method)
+
+
+def value_as_of(index, dates):
+    """Point-in-time valuations from a ValuationIndex for each date."""
+    return index.value_many(pd.Series(dates))
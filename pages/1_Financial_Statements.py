@@ -2,107 +2,21 @@
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from fpdf import FPDF
 from io import BytesIO
 
+from accounting.charts import bar_chart
+from accounting.graph import page_graph
+from accounting.instrument import page_recorder, render_panel
+from accounting.statements import financial_statements
+from accounting.theme import apply_theme, HERO, BUTTONS, TEXT_INPUTS, FILE_UPLOADER
+
 st.set_page_config(layout="wide")
 
 # ✅ Global custom theme
-st.markdown(
-    """
-    <style>
-    body {
-        background-color: #e6defd;
-    }
-    [data-testid="stSidebar"] {
-        background: linear-gradient(135deg, #8c7773 0%, #f2eefe 100%);
-    }
-    .stApp {
-        background-color: #ffffff;
-    }
-    .stApp, .stApp * {
-        color: #533d38;
-    }
-    .hero {
-        background-color: white;
-        padding: 40px;
-        border-radius: 15px;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        max-width: 600px;
-        margin: 50px auto;
-        text-align: center;
-        font-size: 18px;
-    }
-    div.stButton > button {
-        background-color: #8c7773;
-        color: white;
-        border: none;
-        border-radius: 6px;
-        padding: 0.5em 1em;
-    }
-    div.stButton > button:hover {
-        background-color: #735c58;
-    }
-    textarea {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] > div {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] span {
-        color: white !important;
-    }
-    section[data-testid="stTextArea"] textarea {
-        background-color: #8c7773 !important;
-        color: #ffffff !important;
-    }
-    section[data-testid="stTextArea"] textarea::placeholder {
-        color: #ffffff !important;
-    }
-    div[data-baseweb="select"] input {
-      color: #ffffff !important;
-    }
-    
-/* ✅ File uploader outer container */
-section[data-testid="stFileUploader"] {
-  background-color: #8c7773 !important;
-  border-radius: 8px;
-  padding: 1rem;
-  color: #ffffff !important;
-}
-
-/* ✅ File uploader label text */
-section[data-testid="stFileUploader"] label {
-  color: #ffffff !important;
-}
-
-/* ✅ File uploader input button */
-section[data-testid="stFileUploader"] button {
-  background-color: #ffffff !important;
-  color: #8c7773 !important;
-  border: none;
-  border-radius: 6px;
-  padding: 0.5em 1em;
-}
-
-/* ✅ Hover effect for the upload button */
-section[data-testid="stFileUploader"] button:hover {
-  background-color: #f2eefe !important;
-  color: #8c7773 !important;
-}
-
-/* ✅ Text inside uploader */
-section[data-testid="stFileUploader"] div {
-  color: #ffffff !important;
-}
-
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme(HERO, BUTTONS, TEXT_INPUTS, FILE_UPLOADER)
+
+perf = page_recorder("Financial Statements")
+graph = page_graph("Financial Statements")
 
 st.title("📄 Financial Statements Generator")
 
@@ -123,26 +37,32 @@ This app generates:
 
 uploaded_file = st.file_uploader("Upload Trial Balance (.csv or .xlsx)", type=["csv", "xlsx"])
 
-if uploaded_file:
+
+def read_trial_balance(uploaded_file):
     if uploaded_file.name.endswith(".csv"):
-        tb = pd.read_csv(uploaded_file)
-    elif uploaded_file.name.endswith(".xlsx"):
-        tb = pd.read_excel(uploaded_file)
+        return pd.read_csv(uploaded_file)
+    return pd.read_excel(uploaded_file)
+
+
+with perf.stage("upload parse"):
+    if uploaded_file:
+        if not uploaded_file.name.endswith((".csv", ".xlsx")):
+            st.error("❌ Unsupported file type.")
+            st.stop()
+        # Keyed on the upload's name and bytes, so reruns skip the re-read
+        tb = graph.node("upload parse", read_trial_balance, uploaded_file).value
+        st.success("✅ File uploaded successfully!")
     else:
-        st.error("❌ Unsupported file type.")
-        st.stop()
-    st.success("✅ File uploaded successfully!")
-else:
-    st.info("ℹ️ No file uploaded — using built-in sample data!")
-    tb = pd.DataFrame({
-        "Account": ["Cash", "Accounts Receivable", "Supplies", "Equipment",
-                    "Accounts Payable", "Owner's Capital", "Revenue",
-                    "Rent Expense", "Depreciation Expense"],
-        "Type": ["Asset", "Asset", "Asset", "Asset",
-                 "Liability", "Equity", "Revenue",
-                 "Expense", "Non-Cash"],
-        "Amount": [5000, 2000, 800, 3000, 1500, 5000, 8000, 2000, 500]
-    })
+        st.info("ℹ️ No file uploaded — using built-in sample data!")
+        tb = pd.DataFrame({
+            "Account": ["Cash", "Accounts Receivable", "Supplies", "Equipment",
+                        "Accounts Payable", "Owner's Capital", "Revenue",
+                        "Rent Expense", "Depreciation Expense"],
+            "Type": ["Asset", "Asset", "Asset", "Asset",
+                     "Liability", "Equity", "Revenue",
+                     "Expense", "Non-Cash"],
+            "Amount": [5000, 2000, 800, 3000, 1500, 5000, 8000, 2000, 500]
+        })
 
 # ✅ Unified style helper
 def style_df(df):
@@ -155,121 +75,99 @@ def style_df(df):
                     ('color', 'white')]}]
     )
 
-st.write("### 📋 Trial Balance")
-st.markdown(style_df(tb).to_html(), unsafe_allow_html=True)
 
-# ✅ Income Statement
-st.subheader("📑 Income Statement")
-revenues = tb[tb["Type"] == "Revenue"]
-expenses = tb[tb["Type"] == "Expense"]
+def styled_html(df):
+    return style_df(df).to_html()
 
-total_revenue = revenues["Amount"].sum()
-total_expenses = expenses["Amount"].sum()
-net_income = total_revenue - total_expenses
 
-income_statement = pd.concat([
-    pd.DataFrame({"Description": revenues["Account"], "Amount": revenues["Amount"]}),
-    pd.DataFrame({"Description": expenses["Account"], "Amount": -expenses["Amount"]})
-])
+def table_html(df):
+    with perf.stage("styler html"):
+        return graph.node("styler html", styled_html, df).value
 
-income_statement.loc["Total Revenue"] = ["Total Revenue", total_revenue]
-income_statement.loc["Total Expenses"] = ["Total Expenses", -total_expenses]
-income_statement.loc["Net Income"] = ["Net Income", net_income]
 
-st.markdown(style_df(income_statement.reset_index(drop=True)).to_html(), unsafe_allow_html=True)
-
-# ✅ Balance Sheet
-st.subheader("📊 Balance Sheet")
-assets_df = tb[tb["Type"] == "Asset"].copy()
-liabilities_df = tb[tb["Type"] == "Liability"].copy()
-equity_df = tb[tb["Type"] == "Equity"].copy()
-
-# Add Net Income to Equity
-equity_df = pd.concat([
-    equity_df,
-    pd.DataFrame({"Account": ["Net Income"], "Amount": [net_income]})
-])
-
-total_assets = assets_df["Amount"].sum()
-total_liabilities = liabilities_df["Amount"].sum()
-total_equity = equity_df["Amount"].sum()
+st.write("### 📋 Trial Balance")
+st.markdown(table_html(tb), unsafe_allow_html=True)
+
+with perf.stage("statement build"):
+    try:
+        income_statement, balance_sheet, cash_flow, totals = graph.node(
+            "statement build", financial_statements, tb
+        ).value
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
 
-balance_sheet = pd.concat([
-    pd.DataFrame({"Section": "Assets", "Account": assets_df["Account"], "Amount": assets_df["Amount"]}),
-    pd.DataFrame({"Section": "Liabilities", "Account": liabilities_df["Account"], "Amount": liabilities_df["Amount"]}),
-    pd.DataFrame({"Section": "Equity", "Account": equity_df["Account"], "Amount": equity_df["Amount"]})
-]).reset_index(drop=True)
+total_revenue, total_expenses, net_income = totals["Total Revenue"], totals["Total Expenses"], totals["Net Income"]
+total_assets, total_liabilities, total_equity = totals["Total Assets"], totals["Total Liabilities"], totals["Total Equity"]
 
+# ✅ Income Statement
+st.subheader("📑 Income Statement")
+st.markdown(table_html(income_statement), unsafe_allow_html=True)
 
-st.markdown(style_df(balance_sheet).to_html(), unsafe_allow_html=True)
+# ✅ Balance Sheet
+st.subheader("📊 Balance Sheet")
+st.markdown(table_html(balance_sheet), unsafe_allow_html=True)
 
 st.write(f"**Total Assets:** ${total_assets:.2f}")
 st.write(f"**Total Liabilities:** ${total_liabilities:.2f}")
 st.write(f"**Total Equity:** ${total_equity:.2f}")
 st.write(f"**Liabilities + Equity:** ${total_liabilities + total_equity:.2f}")
 
-if abs(total_assets - (total_liabilities + total_equity)) < 1e-2:
+if totals["Balanced"]:
     st.success("✅ Balance Sheet balances!")
 else:
     st.error("⚠️ Balance Sheet does NOT balance! Double-check your Trial Balance.")
 
 # ✅ Cash Flow
 st.subheader("💧 Cash Flow Statement (Indirect)")
-non_cash_expenses = tb[tb["Type"] == "Non-Cash"]["Amount"].sum()
-changes_in_assets = -assets_df["Amount"].sum()
-changes_in_liabilities = liabilities_df["Amount"].sum()
-net_cash_from_ops = net_income + non_cash_expenses + changes_in_assets + changes_in_liabilities
-
-cash_flow = pd.DataFrame({
-    "Item": ["Net Income", "Non-Cash Expenses", "Changes in Assets", "Changes in Liabilities", "Net Cash from Ops"],
-    "Amount": [net_income, non_cash_expenses, changes_in_assets, changes_in_liabilities, net_cash_from_ops]
-})
-
-st.markdown(style_df(cash_flow).to_html(), unsafe_allow_html=True)
+st.markdown(table_html(cash_flow), unsafe_allow_html=True)
 
 # ✅ Charts
 st.subheader("📈 Visuals")
 
-fig1, ax1 = plt.subplots()
-ax1.bar(["Revenue", "Expenses", "Net Income"], [total_revenue, total_expenses, net_income], color=["green", "red", "blue"])
-ax1.set_title("Income Statement Summary")
-st.pyplot(fig1)
-
-fig2, ax2 = plt.subplots()
-ax2.bar(["Assets", "Liabilities", "Equity"], [total_assets, total_liabilities, total_equity], color=["blue", "orange", "green"])
-ax2.set_title("Balance Sheet Summary")
-st.pyplot(fig2)
+with perf.stage("chart render"):
+    st.pyplot(graph.node(
+        "chart render", bar_chart, ["Revenue", "Expenses", "Net Income"], [total_revenue, total_expenses, net_income],
+        "Income Statement Summary", color=["green", "red", "blue"]
+    ).value)
+    st.pyplot(graph.node(
+        "chart render", bar_chart, ["Assets", "Liabilities", "Equity"], [total_assets, total_liabilities, total_equity],
+        "Balance Sheet Summary", color=["blue", "orange", "green"]
+    ).value)
 
 # ✅ PDF Export
 st.subheader("📥 Export PDF Report")
 if st.button("Generate PDF"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-
-    pdf.cell(200, 10, txt="Financial Statements Report", ln=True, align="C")
-    pdf.cell(200, 10, txt="", ln=True)
-
-    pdf.cell(200, 10, txt="Income Statement", ln=True)
-    for _, row in income_statement.iterrows():
-        pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
-
-    pdf.cell(200, 10, txt="", ln=True)
-    pdf.cell(200, 10, txt="Balance Sheet", ln=True)
-    pdf.cell(200, 10, txt=f"Total Assets: ${total_assets:.2f}", ln=True)
-    pdf.cell(200, 10, txt=f"Total Liabilities: ${total_liabilities:.2f}", ln=True)
-    pdf.cell(200, 10, txt=f"Total Equity: ${total_equity:.2f}", ln=True)
-    pdf.cell(200, 10, txt=f"Liabilities + Equity: ${total_liabilities + total_equity:.2f}", ln=True)
-
-    pdf.cell(200, 10, txt="", ln=True)
-    pdf.cell(200, 10, txt="Cash Flow Statement", ln=True)
-    for _, row in cash_flow.iterrows():
-        pdf.cell(200, 10, txt=f"{row['Item']}: ${row['Amount']:.2f}", ln=True)
-
-    pdf_output = BytesIO()
-    pdf_bytes = pdf.output(dest='S').encode('latin-1')
-    pdf_output.write(pdf_bytes)
-    pdf_output.seek(0)
+    with perf.stage("pdf export"):
+        from fpdf import FPDF  # only needed once a report is requested
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+
+        pdf.cell(200, 10, txt="Financial Statements Report", ln=True, align="C")
+        pdf.cell(200, 10, txt="", ln=True)
+
+        pdf.cell(200, 10, txt="Income Statement", ln=True)
+        for _, row in income_statement.iterrows():
+            pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
+
+        pdf.cell(200, 10, txt="", ln=True)
+        pdf.cell(200, 10, txt="Balance Sheet", ln=True)
+        pdf.cell(200, 10, txt=f"Total Assets: ${total_assets:.2f}", ln=True)
+        pdf.cell(200, 10, txt=f"Total Liabilities: ${total_liabilities:.2f}", ln=True)
+        pdf.cell(200, 10, txt=f"Total Equity: ${total_equity:.2f}", ln=True)
+        pdf.cell(200, 10, txt=f"Liabilities + Equity: ${total_liabilities + total_equity:.2f}", ln=True)
+
+        pdf.cell(200, 10, txt="", ln=True)
+        pdf.cell(200, 10, txt="Cash Flow Statement", ln=True)
+        for _, row in cash_flow.iterrows():
+            pdf.cell(200, 10, txt=f"{row['Item']}: ${row['Amount']:.2f}", ln=True)
+
+        pdf_output = BytesIO()
+        pdf_bytes = pdf.output(dest='S').encode('latin-1')
+        pdf_output.write(pdf_bytes)
+        pdf_output.seek(0)
 
     st.download_button(
         "📥 Download PDF",
@@ -277,3 +175,5 @@ if st.button("Generate PDF"):
         "financial_statements.pdf",
         "application/pdf"
     )
+
+render_panel(perf)
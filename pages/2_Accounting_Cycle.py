@@ -2,84 +2,20 @@
 
 import streamlit as st
 import pandas as pd
-from fpdf import FPDF
 from io import BytesIO
 
+from accounting.graph import page_graph
+from accounting.instrument import page_recorder, render_panel
+from accounting.statements import adjusted_trial_balance, cycle_statements, ledger_balances
+from accounting.theme import apply_theme, METRICS, BUTTONS, TEXT_INPUTS, DATA_EDITOR
+
 st.set_page_config(layout="wide")
 
 # ✅ Custom global style for dark theme
-st.markdown(
-    """
-    <style>
-    body {
-        background-color: #e6defd;
-    }
-    [data-testid="stSidebar"] {
-        background: linear-gradient(135deg, #8c7773 0%, #f2eefe 100%);
-    }
-    .stApp {
-        background-color: #ffffff;
-    }
-    .stApp, .stApp * {
-        color: #533d38;
-    }
-    div[data-testid="metric-container"] {
-        background: rgba(93, 64, 55, 0.05);
-        border-radius: 8px;
-        padding: 10px;
-    }
-    div.stButton > button {
-        background-color: #8c7773;
-        color: white;
-        border: none;
-        border-radius: 6px;
-        padding: 0.5em 1em;
-    }
-    div.stButton > button:hover {
-        background-color: #735c58;
-    }
-    textarea {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] > div {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] span {
-        color: white !important;
-    }
-    section[data-testid="stTextArea"] textarea {
-        background-color: #8c7773 !important;
-        color: #ffffff !important;
-    }
-    section[data-testid="stTextArea"] textarea::placeholder {
-        color: #ffffff !important;
-    }
-    div[data-baseweb="select"] input {
-        color: #ffffff !important;
-    }
-    /* Data editor dark style */
-    [data-testid="stDataEditorContainer"] {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    [data-testid="stDataEditorContainer"] .cell {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    [data-testid="stDataEditorContainer"] .col-header {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    [data-testid="stDataEditorContainer"] input {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme(METRICS, BUTTONS, TEXT_INPUTS, DATA_EDITOR)
+
+perf = page_recorder("Accounting Cycle")
+graph = page_graph("Accounting Cycle")
 
 st.title("🔄 Accounting Cycle — Journal, Ledger, ATB, Reports")
 
@@ -117,83 +53,62 @@ def style_df(df):
                     ('color', 'white')]}]
     )
 
+
+def styled_html(df):
+    return style_df(df).to_html()
+
+
+def table_html(df):
+    with perf.stage("styler html"):
+        return graph.node("styler html", styled_html, df).value
+
 # ✅ 2️⃣ Ledger
 st.header("2️⃣ Ledger Accounts")
-ledger = edited_journal.groupby("Account").agg({"Debit": "sum", "Credit": "sum"}).reset_index()
-ledger["Balance"] = ledger["Debit"] - ledger["Credit"]
-st.markdown(style_df(ledger).to_html(), unsafe_allow_html=True)
+with perf.stage("ledger groupby"):
+    # Only an edit to the journal re-keys the ledger and everything after it
+    ledger = graph.node("ledger groupby", ledger_balances, edited_journal)
+st.markdown(table_html(ledger.value), unsafe_allow_html=True)
 
 # ✅ 3️⃣ Adjusted Trial Balance
 st.header("3️⃣ Adjusted Trial Balance")
-atb = ledger.copy()
-atb["DR"] = atb["Balance"].apply(lambda x: x if x > 0 else 0)
-atb["CR"] = atb["Balance"].apply(lambda x: -x if x < 0 else 0)
-atb = atb[["Account", "DR", "CR"]]
-st.markdown(style_df(atb).to_html(), unsafe_allow_html=True)
+with perf.stage("statement build"):
+    atb = graph.node("adjusted trial balance", adjusted_trial_balance, ledger)
+    is_df, bs_df, _ = graph.node("statement build", cycle_statements, atb).value
+st.markdown(table_html(atb.value), unsafe_allow_html=True)
 
 # ✅ 4️⃣ Income Statement
 st.header("4️⃣ Income Statement")
-revenue_accounts = ["Revenue"]
-expense_accounts = ["Rent Expense", "Supplies Expense"]
-supplies_row = atb[atb["Account"] == "Supplies"]
-if not supplies_row.empty:
-    supplies_used = supplies_row["DR"].values[0]
-    if supplies_used > 0:
-        expense_accounts.append("Supplies")
-
-total_revenue = atb[atb["Account"].isin(revenue_accounts)]["CR"].sum()
-total_expenses = atb[atb["Account"].isin(expense_accounts)]["DR"].sum()
-net_income = total_revenue - total_expenses
-
-is_df = pd.DataFrame([
-    ["Total Revenue", total_revenue],
-    ["Total Expenses", total_expenses],
-    ["Net Income", net_income]
-], columns=["Description", "Amount"])
-
-st.markdown(style_df(is_df).to_html(), unsafe_allow_html=True)
+st.markdown(table_html(is_df), unsafe_allow_html=True)
 
 # ✅ 5️⃣ Balance Sheet
 st.header("5️⃣ Balance Sheet")
-assets = ["Cash", "Supplies"]
-liabilities = ["Accounts Payable"]
-equity = ["Owner's Capital"]
-
-total_assets = atb[atb["Account"].isin(assets)]["DR"].sum()
-total_liabilities = atb[atb["Account"].isin(liabilities)]["CR"].sum()
-total_equity = atb[atb["Account"].isin(equity)]["CR"].sum() + net_income
-
-bs_df = pd.DataFrame([
-    ["Total Assets", total_assets],
-    ["Total Liabilities", total_liabilities],
-    ["Owner's Equity", total_equity],
-    ["Liabilities + Equity", total_liabilities + total_equity]
-], columns=["Description", "Amount"])
-
-st.markdown(style_df(bs_df).to_html(), unsafe_allow_html=True)
+st.markdown(table_html(bs_df), unsafe_allow_html=True)
 
 # ✅ 6️⃣ PDF Export
 st.header("6️⃣ Export PDF")
 if st.button("Generate PDF Report"):
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt="Accounting Cycle Report", ln=True, align="C")
-
-    pdf.cell(200, 10, txt="", ln=True)
-    pdf.cell(200, 10, txt="Income Statement", ln=True)
-    for _, row in is_df.iterrows():
-        pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
-
-    pdf.cell(200, 10, txt="", ln=True)
-    pdf.cell(200, 10, txt="Balance Sheet", ln=True)
-    for _, row in bs_df.iterrows():
-        pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
-
-    pdf_output = BytesIO()
-    pdf_bytes = pdf.output(dest='S').encode('latin-1')
-    pdf_output.write(pdf_bytes)
-    pdf_output.seek(0)
+    with perf.stage("pdf export"):
+        from fpdf import FPDF  # only needed once a report is requested
+
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        pdf.cell(200, 10, txt="Accounting Cycle Report", ln=True, align="C")
+
+        pdf.cell(200, 10, txt="", ln=True)
+        pdf.cell(200, 10, txt="Income Statement", ln=True)
+        for _, row in is_df.iterrows():
+            pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
+
+        pdf.cell(200, 10, txt="", ln=True)
+        pdf.cell(200, 10, txt="Balance Sheet", ln=True)
+        for _, row in bs_df.iterrows():
+            pdf.cell(200, 10, txt=f"{row['Description']}: ${row['Amount']:.2f}", ln=True)
+
+        pdf_output = BytesIO()
+        pdf_bytes = pdf.output(dest='S').encode('latin-1')
+        pdf_output.write(pdf_bytes)
+        pdf_output.seek(0)
 
     st.download_button(
         "📥 Download PDF",
@@ -201,3 +116,5 @@ if st.button("Generate PDF Report"):
         "accounting_cycle_report.pdf",
         "application/pdf"
     )
+
+render_panel(perf)
@@ -1,74 +1,27 @@
 # pages/4_Inventory.py
 
+import os
+
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from io import BytesIO
-import xlsxwriter
+
+from accounting.charts import bar_chart
+from accounting.checkpoint import value_incrementally
+from accounting.export import XLSX_MIME, workbook_bytes
+from accounting.graph import page_graph
+from accounting.instrument import page_recorder, render_panel
+from accounting.theme import apply_theme, HERO, BUTTONS, TEXT_INPUTS
+from accounting.multi_sku import value_skus
+from accounting.parsing import load_purchases, load_sales
+from accounting.valuation import is_dated, perpetual_events, value_as_of, valuation_index, value_inventory
 
 # ------------------------------
 # ✅ Custom CSS for background, sidebar, buttons, inputs
 # ------------------------------
-st.markdown(
-    """
-    <style>
-    body {
-        background-color: #e6defd;
-    }
-    [data-testid="stSidebar"] {
-        background: linear-gradient(135deg, #8c7773 0%, #f2eefe 100%);
-    }
-    .stApp {
-        background-color: #ffffff;
-    }
-    .stApp, .stApp * {
-        color:#533d38;
-    }
-    .hero {
-        background-color: white;
-        padding: 40px;
-        border-radius: 15px;
-        box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        max-width: 600px;
-        margin: 50px auto;
-        text-align: center;
-        font-size: 18px;
-    }
-    div.stButton > button {
-        background-color: #8c7773;
-        color: white;
-        border: none;
-        border-radius: 6px;
-        padding: 0.5em 1em;
-    }
-    div.stButton > button:hover {
-        background-color: #735c58;
-    }
-    textarea {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] > div {
-        background-color: #8c7773 !important;
-        color: white !important;
-    }
-    div[data-baseweb="select"] span {
-        color: white !important;
-    }
-    section[data-testid="stTextArea"] textarea {
-        background-color: #8c7773 !important;
-        color: #ffffff !important;
-    }
-    section[data-testid="stTextArea"] textarea::placeholder {
-        color: #ffffff !important;
-    }
-    div[data-baseweb="select"] input {
-      color: #ffffff !important;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme(HERO, BUTTONS, TEXT_INPUTS)
+
+perf = page_recorder("Inventory")
+graph = page_graph("Inventory")
 
 # ------------------------------
 # ✅ Helper: style_df
@@ -83,6 +36,24 @@ def style_df(df):
                     ('color', 'white')]}]
     )
 
+# Styled HTML tables get slow past a few thousand rows; larger inputs
+# are previewed and the full data goes to the Excel download
+PREVIEW_ROWS = 1000
+
+CHECKPOINT_DIR = os.path.join(".checkpoints", "inventory")
+
+
+def preview_html(df):
+    return style_df(df).to_html()
+
+
+def show_table(df):
+    with perf.stage("styler html"):
+        html = graph.node("styler html", preview_html, df.head(PREVIEW_ROWS)).value
+    st.markdown(html, unsafe_allow_html=True)
+    if len(df) > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} of {len(df):,} rows — download Excel for all of them.")
+
 # ------------------------------
 # ✅ Title & description
 # ------------------------------
@@ -102,190 +73,188 @@ using:
 # ✅ User Inputs
 # ------------------------------
 purchases_input = st.text_area(
-    "📋 Purchases (Qty, Cost per Unit) — one per line",
+    "📋 Purchases (Qty, Cost per Unit) — one per line, optionally prefixed with a Date",
     value="10, 5\n15, 6\n20, 7"
 )
 
 sales_input = st.text_area(
-    "📋 Sales Quantities — one per line (for Perpetual, order matters)",
+    "📋 Sales Quantities — one per line, optionally prefixed with a Date (for Perpetual, order matters)",
     value="20\n10"
 )
 
+purchases_file = st.file_uploader(
+    "…or upload Purchases (.csv or .xlsx) with Qty, Cost and optional Date columns", type=["csv", "xlsx"]
+)
+sales_file = st.file_uploader(
+    "…or upload Sales (.csv or .xlsx) with a Qty column and optional Date column", type=["csv", "xlsx"]
+)
+
 method = st.selectbox("Inventory Method", ["FIFO", "LIFO", "Weighted Average"])
 system = st.selectbox("Inventory System", ["Periodic", "Perpetual"])
+resume = system == "Perpetual" and st.checkbox(
+    "♻️ Resume from the last checkpoint (replay only events added since the last calculation)"
+)
+asof_input = st.text_area(
+    "📅 Value as of Dates — one per line (Perpetual, dated purchases & sales)", value=""
+) if system == "Perpetual" else ""
 
 # ------------------------------
 # ✅ Parse Purchases & Sales
 # ------------------------------
-purchases_list = []
-for line in purchases_input.strip().split("\n"):
-    qty, cost = map(float, line.split(","))
-    purchases_list.append({"Qty": qty, "Cost": cost})
-df_purchases = pd.DataFrame(purchases_list)
-
-sales_qty_list = [float(q) for q in sales_input.strip().split("\n") if q]
+# Parsed tables, results and rendered previews are memoized on their inputs,
+# so a rerun only recomputes the stages downstream of whatever changed
+with perf.stage("upload parse"):
+    try:
+        purchases, purchase_errors = graph.node("parse purchases", load_purchases, purchases_file, purchases_input).split()
+        sales, sale_errors = graph.node("parse sales", load_sales, sales_file, sales_input).split()
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+
+df_purchases = purchases.value
+df_sales = sales.value
+
+for label, errors in [("purchase", purchase_errors.value), ("sale", sale_errors.value)]:
+    if len(errors):
+        st.warning(f"⚠️ Skipped {len(errors)} invalid {label} line(s).")
+        st.dataframe(errors, use_container_width=True)
+
+dated = is_dated(df_purchases, df_sales)
 
 # ✅ Show Purchases
 st.write("### ✅ Purchases")
-st.markdown(style_df(df_purchases).to_html(), unsafe_allow_html=True)
+show_table(df_purchases)
 
 # ✅ Show Sales as styled table
 st.write("### ✅ Sales")
-df_sales = pd.DataFrame({"Sales Qty": sales_qty_list})
-st.markdown(style_df(df_sales).to_html(), unsafe_allow_html=True)
+show_table(df_sales)
 
 
 # ------------------------------
 # ✅ Calculate
 # ------------------------------
 if st.button("Calculate COGS & Ending Inventory"):
-    if system == "Periodic":
-        total_sales = sum(sales_qty_list)
-        qty_needed = total_sales
-
-        if method == "FIFO":
-            cogs = 0
-            layers = []
-            for _, row in df_purchases.iterrows():
-                if qty_needed == 0:
-                    break
-                use_qty = min(row["Qty"], qty_needed)
-                cogs += use_qty * row["Cost"]
-                layers.append({"Qty Used": use_qty, "Cost": row["Cost"], "Total Cost": use_qty * row["Cost"]})
-                qty_needed -= use_qty
-
-            ending_inv = 0
-            for _, row in df_purchases.iterrows():
-                used_qty = sum([l["Qty Used"] for l in layers if l["Cost"] == row["Cost"]])
-                remaining_qty = row["Qty"] - used_qty
-                if remaining_qty > 0:
-                    ending_inv += remaining_qty * row["Cost"]
-
-        elif method == "LIFO":
-            cogs = 0
-            layers = []
-            for _, row in df_purchases[::-1].iterrows():
-                if qty_needed == 0:
-                    break
-                use_qty = min(row["Qty"], qty_needed)
-                cogs += use_qty * row["Cost"]
-                layers.append({"Qty Used": use_qty, "Cost": row["Cost"], "Total Cost": use_qty * row["Cost"]})
-                qty_needed -= use_qty
-
-            ending_inv = 0
-            for _, row in df_purchases.iterrows():
-                used_qty = sum([l["Qty Used"] for l in layers if l["Cost"] == row["Cost"]])
-                remaining_qty = row["Qty"] - used_qty
-                if remaining_qty > 0:
-                    ending_inv += remaining_qty * row["Cost"]
-
-        elif method == "Weighted Average":
-            total_qty = df_purchases["Qty"].sum()
-            total_cost = (df_purchases["Qty"] * df_purchases["Cost"]).sum()
-            avg_cost = total_cost / total_qty if total_qty else 0
-            cogs = total_sales * avg_cost
-            ending_inv = (total_qty - total_sales) * avg_cost
-            layers = [{
-                "Total Qty": total_qty,
-                "Avg Cost": avg_cost,
-                "Qty Sold": total_sales,
-                "COGS": cogs,
-                "Ending Inventory": ending_inv
-            }]
-
-        st.success(f"📌 Periodic COGS ({method}): ${cogs:.2f}")
-        st.info(f"📦 Ending Inventory ({method}): ${ending_inv:.2f}")
-
-        flow_df = pd.DataFrame(layers)
-
-    elif system == "Perpetual":
-        layers = df_purchases.copy().to_dict('records')
-        cogs = 0
-        flow_rows = []
-
-        if method in ["FIFO", "LIFO"]:
-            for sale_qty in sales_qty_list:
-                qty_needed = sale_qty
-
-                if method == "FIFO":
-                    layer_iter = layers
-                else:  # LIFO
-                    layer_iter = layers[::-1]
-
-                for layer in layer_iter:
-                    if qty_needed == 0:
-                        break
-                    available = layer["Qty"]
-                    use_qty = min(available, qty_needed)
-                    flow_rows.append({
-                        "Sale Qty": use_qty,
-                        "Cost": layer["Cost"],
-                        "Total Cost": use_qty * layer["Cost"]
-                    })
-                    cogs += use_qty * layer["Cost"]
-                    layer["Qty"] -= use_qty
-                    qty_needed -= use_qty
-
-            ending_inv = sum([layer["Qty"] * layer["Cost"] for layer in layers])
-
-        elif method == "Weighted Average":
-            running_layers = []
-            for purchase in layers:
-                running_layers.append(purchase)
-
-            total_qty = sum(p["Qty"] for p in running_layers)
-            total_cost = sum(p["Qty"] * p["Cost"] for p in running_layers)
-
-            for sale_qty in sales_qty_list:
-                avg_cost = total_cost / total_qty if total_qty else 0
-                flow_rows.append({
-                    "Sale Qty": sale_qty,
-                    "Avg Cost": avg_cost,
-                    "COGS for Sale": sale_qty * avg_cost
-                })
-                cogs += sale_qty * avg_cost
-                total_qty -= sale_qty
-                total_cost -= sale_qty * avg_cost
-
-            ending_inv = total_qty * avg_cost
-
-        st.success(f"📌 Perpetual COGS ({method}): ${cogs:.2f}")
-        st.info(f"📦 Ending Inventory ({method}): ${ending_inv:.2f}")
-
-        flow_df = pd.DataFrame(flow_rows)
+    with perf.stage("inventory engine"):
+        try:
+            if resume:
+                # Checkpoints live on disk, so this path always runs
+                events = graph.node("event table", perpetual_events, purchases, sales)
+                # Each upload / pasted history keeps its own checkpoint lineage
+                label = purchases_file.name if purchases_file else "pasted"
+                state, resumed_from, flow = value_incrementally(events.value, method, CHECKPOINT_DIR, label)
+                cogs, ending_inv, shortfall = state.cogs, state.ending_inventory, state.shortfall
+            else:
+                valuation = graph.node("inventory engine", value_inventory, purchases, sales, method, system)
+                cogs, ending_inv, flow, events, shortfall = valuation.split()
+                cogs, ending_inv, flow, shortfall = cogs.value, ending_inv.value, flow.value, shortfall.value
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            st.stop()
+
+    flow_df = flow if system == "Periodic" else flow.to_frame()
+
+    st.success(f"📌 {system} COGS ({method}): ${cogs:.2f}")
+    st.info(f"📦 Ending Inventory ({method}): ${ending_inv:.2f}")
+    if shortfall > 0:
+        st.warning(f"⚠️ Sales exceed the quantity on hand by {shortfall:,.2f} unit(s).")
+
+    if resume:
+        st.caption(
+            f"♻️ Resumed from a checkpoint at event {resumed_from:,}; "
+            f"replayed {len(events.value) - resumed_from:,} new event(s)."
+        )
+
+    asof_lines = [line.strip() for line in asof_input.split("\n") if line.strip()]
+    if asof_lines and not dated:
+        st.warning("⚠️ Point-in-time valuation needs a Date on every purchase and sale.")
+    elif asof_lines:
+        asof_dates = pd.to_datetime(pd.Series(asof_lines), errors="coerce", format="mixed")
+        if asof_dates.isna().any():
+            st.warning(f"⚠️ Skipped {int(asof_dates.isna().sum())} invalid as-of date(s).")
+        st.write("### 📅 Point-in-Time Valuation")
+        with perf.stage("as-of valuation"):
+            # The index only depends on the history, so new dates reuse it
+            index = graph.node("as-of index", valuation_index, events, method)
+            asof_df = graph.node("as-of valuation", value_as_of, index, asof_dates.dropna()).value
+        show_table(asof_df)
 
     # ✅ Show Step-by-Step Flow styled
     st.write("### 🧾 Step-by-Step Flow")
-    st.markdown(style_df(flow_df).to_html(), unsafe_allow_html=True)
-
-    # ✅ Download Excel
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-        df_purchases.to_excel(writer, sheet_name="Purchases", index=False)
-        pd.DataFrame({"Sales Qty": sales_qty_list}).to_excel(writer, sheet_name="Sales", index=False)
-        flow_df.to_excel(writer, sheet_name="Flow Steps", index=False)
-
-        workbook = writer.book
-        for sheet_name in ["Purchases", "Sales", "Flow Steps"]:
-            worksheet = writer.sheets[sheet_name]
-            header_format = workbook.add_format({'bold': True, 'border': 1})
-            columns = (
-                flow_df.columns if sheet_name == "Flow Steps"
-                else df_purchases.columns if sheet_name == "Purchases"
-                else ["Sales Qty"]
-            )
-            for col_num, value in enumerate(columns):
-                worksheet.write(0, col_num, value, header_format)
+    show_table(flow_df)
+
+    # ✅ Download Excel (built on click from a temp file, rows written straight from arrays)
+    sheets = [
+        ("Purchases", df_purchases),
+        ("Sales", {"Sales Qty": df_sales["Sales Qty"].to_numpy()}),
+        ("Flow Steps", flow),
+    ]
+
+    def timed_workbook():
+        # Runs on click, after this run's panel is drawn; the record still
+        # goes to the perf log
+        with perf.stage("excel export"):
+            return workbook_bytes(sheets)
 
     st.download_button(
         label="📥 Download Multi-Sheet Excel",
-        data=buffer.getvalue(),
+        data=timed_workbook,
         file_name="inventory_multi_sheet.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        mime=XLSX_MIME
     )
 
     # ✅ Chart
-    fig, ax = plt.subplots()
-    ax.bar(["COGS", "Ending Inventory"], [cogs, ending_inv], color=["red", "green"])
-    ax.set_title(f"{system} — {method} — Cost Breakdown")
-    st.pyplot(fig)
+    with perf.stage("chart render"):
+        st.pyplot(graph.node(
+            "chart render", bar_chart, ["COGS", "Ending Inventory"], [cogs, ending_inv],
+            f"{system} — {method} — Cost Breakdown", color=["red", "green"]
+        ).value)
+
+
+# ------------------------------
+# ✅ Multi-SKU Valuation
+# ------------------------------
+st.write("## 🏷️ Multi-SKU Valuation (Periodic)")
+st.markdown("""
+Upload **Purchases** (`SKU`, `Qty`, `Cost`, optional `Method`) and **Sales** (`SKU`, `Qty`)
+as **CSV** or **Excel**. Each SKU is valued with its own `Method`
+(FIFO, LIFO, Weighted Average), falling back to the method selected above.
+""")
+
+
+def read_table(uploaded_file):
+    if uploaded_file.name.endswith(".csv"):
+        return pd.read_csv(uploaded_file)
+    return pd.read_excel(uploaded_file)
+
+
+sku_purchases_file = st.file_uploader("Upload SKU Purchases (.csv or .xlsx)", type=["csv", "xlsx"], key="sku_purchases")
+sku_sales_file = st.file_uploader("Upload SKU Sales (.csv or .xlsx)", type=["csv", "xlsx"], key="sku_sales")
+
+if sku_purchases_file and sku_sales_file and st.button("Value All SKUs"):
+    sku_purchases = graph.node("read sku purchases", read_table, sku_purchases_file)
+    sku_sales = graph.node("read sku sales", read_table, sku_sales_file)
+
+    try:
+        with perf.stage("multi-sku valuation"):
+            per_sku, totals = graph.node("multi-sku valuation", value_skus, sku_purchases, sku_sales, method).value
+    except (KeyError, ValueError) as e:
+        st.error(f"❌ Could not value SKUs: {e}")
+        st.stop()
+
+    st.success(f"📌 Company COGS ({totals['SKUs']} SKUs): ${totals['COGS']:,.2f}")
+    st.info(f"📦 Company Ending Inventory: ${totals['Ending Inventory']:,.2f}")
+    if totals["Oversold SKUs"]:
+        st.warning(
+            f"⚠️ {totals['Oversold SKUs']} SKU(s) sold more than was purchased (including SKUs never purchased); "
+            "the uncosted quantity is in the Shortfall column."
+        )
+    st.dataframe(per_sku, use_container_width=True)
+
+    st.download_button(
+        "📥 Download Per-SKU Valuation as CSV",
+        per_sku.to_csv(index=False).encode("utf-8"),
+        "inventory_by_sku.csv",
+        "text/csv"
+    )
+
+render_panel(perf)
@@ -0,0 +1,178 @@
+# scripts/load_test.py
+"""Throughput check for the local accounting service.
+
+Fires a mix of statements, cycle, depreciation and inventory jobs at the
+service from several client threads and reports requests/s, jobs/s and
+latency percentiles. By default the payloads repeat, which measures the
+cached path; --distinct makes every job unique so each one is computed.
+
+    python scripts/load_test.py --serve              # start a service in-process
+    python scripts/load_test.py --url http://127.0.0.1:8765 --requests 2000 --concurrency 32
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ["statements", "cycle", "depreciation", "inventory"]
+
+
+# ------------------------------
+# ✅ Sample payloads
+# ------------------------------
+def statements_job(rng, distinct):
+    bump = rng.randint(0, 10_000) if distinct else 0
+    return {"trial_balance": [
+        {"Account": "Cash", "Type": "Asset", "Amount": 5000 + bump},
+        {"Account": "Accounts Receivable", "Type": "Asset", "Amount": 2000},
+        {"Account": "Supplies", "Type": "Asset", "Amount": 800},
+        {"Account": "Equipment", "Type": "Asset", "Amount": 3000},
+        {"Account": "Accounts Payable", "Type": "Liability", "Amount": 1500},
+        {"Account": "Owner's Capital", "Type": "Equity", "Amount": 5000},
+        {"Account": "Revenue", "Type": "Revenue", "Amount": 8000 + bump},
+        {"Account": "Rent Expense", "Type": "Expense", "Amount": 2000},
+        {"Account": "Depreciation Expense", "Type": "Non-Cash", "Amount": 500},
+    ]}
+
+
+def cycle_job(rng, distinct):
+    revenue = 2500 + (rng.randint(0, 10_000) if distinct else 0)
+    return {"journal": [
+        {"Date": "2025-01-01", "Account": "Cash", "Debit": 5000, "Credit": 0},
+        {"Date": "2025-01-01", "Account": "Owner's Capital", "Debit": 0, "Credit": 5000},
+        {"Date": "2025-01-05", "Account": "Supplies", "Debit": 1200, "Credit": 0},
+        {"Date": "2025-01-05", "Account": "Cash", "Debit": 0, "Credit": 1200},
+        {"Date": "2025-01-10", "Account": "Revenue", "Debit": 0, "Credit": revenue},
+        {"Date": "2025-01-10", "Account": "Cash", "Debit": revenue, "Credit": 0},
+        {"Date": "2025-01-15", "Account": "Rent Expense", "Debit": 800, "Credit": 0},
+        {"Date": "2025-01-15", "Account": "Cash", "Debit": 0, "Credit": 800},
+    ]}
+
+
+def depreciation_job(rng, distinct):
+    return {
+        "method": rng.choice(["Straight-Line", "Double Declining Balance"]) if distinct else "Straight-Line",
+        "cost": 10_000 + (rng.randint(0, 10_000) if distinct else 0),
+        "salvage": 1000,
+        "useful_life": 5,
+    }
+
+
+def inventory_job(rng, distinct, rows):
+    seed = rng.randint(0, 1 << 30) if distinct else 0
+    local = random.Random(seed)
+    purchases = "\n".join(f"2025-01-{1 + i % 28:02d}, {local.randint(1, 50)}, {local.uniform(1, 20):.2f}" for i in range(rows))
+    sales = "\n".join(f"2025-01-{1 + i % 28:02d}, {local.randint(1, 20)}" for i in range(rows))
+    return {
+        "purchases": purchases,
+        "sales": sales,
+        "method": local.choice(["FIFO", "LIFO", "Weighted Average"]),
+        "system": "Perpetual",
+        "as_of": ["2025-01-10", "2025-01-20"],
+    }
+
+
+def make_job(endpoint, rng, args):
+    if endpoint == "inventory":
+        return inventory_job(rng, args.distinct, args.rows)
+    return {"statements": statements_job, "cycle": cycle_job, "depreciation": depreciation_job}[endpoint](rng, args.distinct)
+
+
+# ------------------------------
+# ✅ Client threads
+# ------------------------------
+def client(url, args, n_requests, seed, latencies, failures):
+    rng = random.Random(seed)
+    endpoints = ENDPOINTS if args.endpoint == "all" else [args.endpoint]
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=300)
+    try:
+        for _ in range(n_requests):
+            endpoint = rng.choice(endpoints)
+            jobs = [make_job(endpoint, rng, args) for _ in range(args.batch)]
+            body = json.dumps(jobs if args.batch > 1 else jobs[0]).encode("utf-8")
+
+            start = time.perf_counter()
+            conn.request("POST", f"/{endpoint}", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            data = response.read()
+            latencies.append(time.perf_counter() - start)
+
+            if response.status != 200:
+                failures.append(f"/{endpoint} {response.status}: {data[:200].decode('utf-8', 'replace')}")
+    finally:
+        conn.close()
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the local accounting service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--serve", action="store_true", help="start a service in this process on a free port")
+    parser.add_argument("--workers", type=int, default=4, help="worker pool size for --serve")
+    parser.add_argument("--requests", type=int, default=400, help="total requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads")
+    parser.add_argument("--batch", type=int, default=1, help="jobs per request")
+    parser.add_argument("--endpoint", default="all", choices=["all"] + ENDPOINTS)
+    parser.add_argument("--rows", type=int, default=500, help="purchases and sales per inventory job")
+    parser.add_argument("--distinct", action="store_true", help="unique payloads, so every job misses the cache")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.serve:
+        sys.path.insert(0, ROOT)
+        from accounting.service import make_server
+
+        server = make_server(port=0, workers=args.workers, max_pending=max(args.concurrency * args.batch, args.workers * 8))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        args.url = f"http://127.0.0.1:{server.server_port}"
+    url = urlparse(args.url)
+
+    latencies, failures = [], []
+    per_client = [args.requests // args.concurrency + (i < args.requests % args.concurrency) for i in range(args.concurrency)]
+    threads = [
+        threading.Thread(target=client, args=(url, args, n, seed, latencies, failures))
+        for seed, n in enumerate(per_client) if n
+    ]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    conn.request("GET", "/health")
+    health = json.loads(conn.getresponse().read())
+    conn.close()
+
+    done = len(latencies)
+    print(f"{done} requests ({done * args.batch} jobs) in {elapsed:.2f}s with {args.concurrency} clients")
+    print(f"  throughput  {done / elapsed:,.1f} req/s, {done * args.batch / elapsed:,.1f} jobs/s")
+    if latencies:
+        print(f"  latency     p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+              f"p95 {percentile(latencies, 95) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"  cache       {health['cache']['hits']} hits, {health['cache']['misses']} misses")
+    print(f"  failures    {len(failures)}")
+    for failure in failures[:5]:
+        print(f"    {failure}")
+
+    if server:
+        server.shutdown()
+        server.service.shutdown()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
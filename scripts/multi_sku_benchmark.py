@@ -0,0 +1,87 @@
+# scripts/multi_sku_benchmark.py
+"""Scaling check for the parallel multi-SKU valuation.
+
+Times the serial part of value_skus (partitioning in the parent) against
+the block valuations that run in the workers, then the wall time for each
+worker count. The serial share bounds the speedup (Amdahl's law), so it is
+reported next to the measured speedups.
+
+    python scripts/multi_sku_benchmark.py [--rows 2000000] [--skus 80000] [--workers 1 2 4 8] [--sku-type mixed]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from accounting.multi_sku import _partition, _value_task, value_skus  # noqa: E402
+
+
+def sample(rows, skus, sku_type="mixed", seed=0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, skus, rows)
+    if sku_type == "int":
+        sku = codes
+    elif sku_type == "str":
+        sku = np.char.add("SKU-", codes.astype(str)).astype(object)
+    else:
+        # Excel-style mixed column: numbers, with every fifth SKU a text code
+        sku = codes.astype(object)
+        text = codes % 5 == 0
+        sku[text] = np.char.add("A-", codes[text].astype(str))
+    purchases = pd.DataFrame({
+        "SKU": sku,
+        "Qty": rng.integers(1, 50, rows).astype(float),
+        "Cost": rng.uniform(1, 20, rows),
+        "Method": rng.choice(["FIFO", "LIFO", "Weighted Average", None], rows),
+    })
+    sales = purchases[["SKU"]].sample(frac=0.5, random_state=seed).reset_index(drop=True)
+    sales["Qty"] = rng.integers(1, 60, len(sales)).astype(float)
+    return purchases, sales
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--skus", type=int, default=80_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cpus}))
+    parser.add_argument("--sku-type", choices=["int", "str", "mixed"], default="mixed",
+                        help="SKU column as integers, strings, or Excel-style numbers mixed with text")
+    args = parser.parse_args(argv)
+
+    purchases, sales = sample(args.rows, args.skus, args.sku_type)
+    print(f"{args.rows:,} purchase rows, {len(sales):,} sale rows, {args.skus:,} {args.sku_type} SKUs, {cpus} CPU(s)")
+
+    start = time.perf_counter()
+    tasks, _ = _partition(purchases, sales, 4 * max(args.workers), default_method=0)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    for task in tasks:
+        _value_task(task)
+    parallel = time.perf_counter() - start
+    share = serial / (serial + parallel)
+    print(f"parent partitioning {serial:.2f}s, block valuation {parallel:.2f}s "
+          f"→ serial share {share:.0%}")
+
+    baseline = None
+    print(f"{'workers':>8}{'wall s':>9}{'speedup':>9}{'Amdahl max':>12}")
+    for workers in args.workers:
+        start = time.perf_counter()
+        value_skus(purchases, sales, workers=workers)
+        wall = time.perf_counter() - start
+        baseline = baseline or wall
+        bound = 1 / (share + (1 - share) / min(workers, cpus))
+        print(f"{workers:>8}{wall:>9.2f}{baseline / wall:>8.2f}x{bound:>11.2f}x")
+    if max(args.workers) > cpus:
+        print(f"(only {cpus} CPU(s) here; worker counts above that cannot speed up)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# scripts/startup_benchmark.py
+"""Time-to-first-render check for main.py and every page.
+
+Each page is run through Streamlit's AppTest in a fresh interpreter, so
+the timing includes every import the page pulls in, as on a cold
+container. The script fails when a page is over budget or when its
+first render loads a stack that should only load on first use.
+
+    python scripts/startup_benchmark.py [--budget 1.0] [--repeat 3]
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Plotting, PDF, Excel and JIT stacks are imported on first use
+LAZY_MODULES = ("matplotlib", "fpdf", "xlsxwriter", "numba")
+
+# The statements page draws its summary charts on every load, so it may
+# load matplotlib and gets that much extra time on top of --budget
+ALLOWED = {
+    "pages/1_Financial_Statements.py": {"matplotlib"},
+}
+EXTRA_SECONDS = {
+    "pages/1_Financial_Statements.py": 1.0,
+}
+
+
+def app_scripts():
+    return ["main.py"] + sorted(
+        os.path.relpath(path, ROOT).replace(os.sep, "/")
+        for path in glob.glob(os.path.join(ROOT, "pages", "*.py"))
+    )
+
+
+def first_render(script):
+    """Run `script` once in this interpreter and describe the run."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=120)
+    start = time.perf_counter()
+    at.run()
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "loaded": sorted(m for m in LAZY_MODULES if m in sys.modules),
+        "exceptions": [e.value for e in at.exception],
+    }
+
+
+def measure(script):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", script],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds allowed per page (default 1.0)")
+    parser.add_argument("--repeat", type=int, default=3, help="cold runs per page; the median is reported")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(first_render(args.child)))
+        return 0
+
+    failures = []
+    print(f"{'script':<36}{'median s':>10}  lazy stacks loaded")
+    for script in app_scripts():
+        runs = [measure(script) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        loaded = set(runs[-1]["loaded"])
+        print(f"{script:<36}{seconds:>10.3f}  {', '.join(sorted(loaded)) or '-'}")
+
+        if runs[-1]["exceptions"]:
+            failures.append(f"{script}: raised {runs[-1]['exceptions'][0]}")
+        budget = args.budget + EXTRA_SECONDS.get(script, 0.0)
+        if seconds > budget:
+            failures.append(f"{script}: {seconds:.3f}s is over its {budget:.3f}s budget")
+        eager = loaded - ALLOWED.get(script, set())
+        if eager:
+            failures.append(f"{script}: first render imported {', '.join(sorted(eager))}")
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if not failures:
+        print("✅ Every page rendered within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# tests/test_engines.py
+#
+# The vectorized inventory engines checked against plain-Python replays of
+# the same event streams. Run with `pytest` from the repo root.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting.checkpoint import LayerState, _checkpoints, advance, lineage_directory, value_incrementally
+from accounting.inventory import _layer_values, _value_recurrence, event_table, moving_average
+
+
+# ------------------------------
+# ✅ Plain-Python references
+# ------------------------------
+def reference_average(is_purchase, qty, cost):
+    """Moving average one event at a time: (avg_cost, onhand) per event."""
+    value = onhand = avg = 0.0
+    avg_out, onhand_out = [], []
+    for purchase, q, c in zip(is_purchase, qty, cost):
+        if purchase:
+            value += q * c
+            onhand += q
+            avg = value / onhand if onhand > 0 else 0.0
+        else:
+            value -= q * avg
+            onhand -= q
+        avg_out.append(avg)
+        onhand_out.append(onhand)
+    return np.array(avg_out), np.array(onhand_out)
+
+
+def reference_layers(events, method):
+    """FIFO / LIFO over an event_table with a list of [qty, cost] layers."""
+    layers, cogs, shortfall = [], 0.0, 0.0
+    for sale, q, c in zip(events["Sale"], events["Qty"], events["Cost"]):
+        if not sale:
+            if q > 0:
+                layers.append([q, c])
+            continue
+        while q > 0 and layers:
+            layer = layers[0] if method == "FIFO" else layers[-1]
+            use = min(layer[0], q)
+            cogs += use * layer[1]
+            layer[0] -= use
+            q -= use
+            if layer[0] == 0:
+                layers.remove(layer)
+        shortfall += q
+    return cogs, sum(q * c for q, c in layers), shortfall
+
+
+# ------------------------------
+# ✅ Random interleaved streams
+# ------------------------------
+def random_stream(rng, n, stockout_rate):
+    """(is_purchase, qty, cost) that never oversells; sales empty the stock at `stockout_rate`."""
+    is_purchase, qty, cost = [], [], []
+    onhand = 0.0
+    for _ in range(n):
+        if onhand == 0 or rng.random() < 0.5:
+            q = float(rng.integers(1, 50))
+            is_purchase.append(True)
+            cost.append(float(rng.uniform(1, 20)))
+            onhand += q
+        else:
+            q = onhand if rng.random() < stockout_rate else float(rng.integers(1, onhand + 1))
+            is_purchase.append(False)
+            cost.append(0.0)
+            onhand -= q
+        qty.append(q)
+    return np.array(is_purchase), np.array(qty), np.array(cost)
+
+
+def random_events(rng, n, oversell=False):
+    """A dated event_table with distinct times; `oversell` lets sales exceed the stock."""
+    is_purchase, qty, cost = random_stream(rng, n, stockout_rate=0.2)
+    if oversell:
+        qty = np.where(is_purchase, qty, qty + rng.integers(0, 5, n))
+    times = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(n), unit="min")
+    purchases = pd.DataFrame({"Date": times[is_purchase], "Qty": qty[is_purchase], "Cost": cost[is_purchase]})
+    sales = pd.DataFrame({"Date": times[~is_purchase], "Sales Qty": qty[~is_purchase]})
+    return event_table(purchases, sales)
+
+
+# ------------------------------
+# ✅ Moving average
+# ------------------------------
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("stockout_rate", [0.0, 0.05, 0.6])
+def test_moving_average_matches_reference(seed, stockout_rate):
+    rng = np.random.default_rng(seed)
+    stream = random_stream(rng, 5_000, stockout_rate)
+    avg, onhand = moving_average(*stream)
+    ref_avg, ref_onhand = reference_average(*stream)
+    np.testing.assert_allclose(onhand, ref_onhand, atol=1e-9)
+    np.testing.assert_allclose(avg, ref_avg, rtol=1e-9, atol=1e-9)
+
+
+def test_layer_values_with_many_resets_per_chunk():
+    rng = np.random.default_rng(7)
+    carry = rng.uniform(0.2, 1.0, 4_000)
+    carry[rng.random(4_000) < 0.05] = 0.0  # ~50 restarts per 1024-purchase chunk
+    added = rng.uniform(1, 100, 4_000)
+    assert (carry[:1024] == 0).sum() > 8
+    np.testing.assert_allclose(_layer_values(carry, added), _value_recurrence(carry, added, 0.0), rtol=1e-9)
+
+
+def test_layer_values_when_carry_product_underflows():
+    carry = np.full(300, 1e-3)  # cumprod drops below 1e-200 well inside one chunk
+    added = np.linspace(1, 10, 300)
+    np.testing.assert_allclose(_layer_values(carry, added), _value_recurrence(carry, added, 0.0), rtol=1e-9)
+
+
+def test_moving_average_rejects_oversell():
+    with pytest.raises(ValueError, match="exceeds the quantity on hand"):
+        moving_average([True, False], [5.0, 6.0], [2.0, 0.0])
+
+
+# ------------------------------
+# ✅ advance() per method
+# ------------------------------
+def chunked_advance(events, method, rng):
+    """advance() over random consecutive slices, as checkpoint resumes do."""
+    state = LayerState(method)
+    cuts = np.sort(rng.choice(np.arange(1, len(events)), size=10, replace=False))
+    for lo, hi in zip([0, *cuts], [*cuts, len(events)]):
+        state, _ = advance(state, events.iloc[lo:hi], keep_flow=False)
+    return state
+
+
+@pytest.mark.parametrize("method", ["FIFO", "LIFO"])
+@pytest.mark.parametrize("seed", range(3))
+def test_advance_layers_match_reference(method, seed):
+    rng = np.random.default_rng(seed)
+    events = random_events(rng, 3_000, oversell=True)
+    cogs, ending, shortfall = reference_layers(events, method)
+
+    state, flow = advance(LayerState(method), events)
+    assert state.cogs == pytest.approx(cogs, rel=1e-12)
+    assert state.ending_inventory == pytest.approx(ending, rel=1e-12)
+    assert state.shortfall == pytest.approx(shortfall)
+    assert flow.column("Total Cost").sum() == pytest.approx(cogs, rel=1e-12)
+
+    resumed = chunked_advance(events, method, rng)
+    assert resumed.cogs == pytest.approx(cogs, rel=1e-12)
+    assert resumed.shortfall == pytest.approx(shortfall)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_advance_average_matches_reference(seed):
+    rng = np.random.default_rng(seed)
+    events = random_events(rng, 3_000)
+    sale = events["Sale"].to_numpy()
+    ref_avg, ref_onhand = reference_average(~sale, events["Qty"].to_numpy(), events["Cost"].to_numpy())
+    cogs = float((events["Qty"].to_numpy() * ref_avg)[sale].sum())
+
+    for state in (advance(LayerState("Weighted Average"), events)[0],
+                  chunked_advance(events, "Weighted Average", rng)):
+        assert state.cogs == pytest.approx(cogs, rel=1e-9)
+        assert state.onhand == pytest.approx(ref_onhand[-1], abs=1e-9)
+        assert state.ending_inventory == pytest.approx(ref_onhand[-1] * ref_avg[-1], rel=1e-9, abs=1e-9)
+
+
+def test_advance_average_rejects_oversell():
+    events = random_events(np.random.default_rng(0), 200, oversell=True)
+    with pytest.raises(ValueError, match="exceeds the quantity on hand"):
+        advance(LayerState("Weighted Average"), events)
+
+
+def test_oversell_names_the_event_in_the_whole_history():
+    times = pd.Timestamp("2025-01-01") + pd.to_timedelta(np.arange(1_200), unit="min")
+    purchases = pd.DataFrame({"Date": times[::2], "Qty": 10.0, "Cost": 2.0})
+    sales = pd.DataFrame({"Date": times[1::2], "Sales Qty": 1.0})
+    events = event_table(purchases, sales)
+    assert events.loc[1005, "Sale"]
+    events.loc[1005, "Qty"] = 1e6
+
+    with pytest.raises(ValueError, match="Sale at event 1005 exceeds"):
+        advance(LayerState("Weighted Average"), events)
+    resumed, _ = advance(LayerState("Weighted Average"), events.iloc[:1000], keep_flow=False)
+    with pytest.raises(ValueError, match="Sale at event 1005 exceeds"):
+        advance(resumed, events.iloc[1000:])
+
+
+# ------------------------------
+# ✅ Checkpoint prefix invalidation
+# ------------------------------
+def saved_positions(directory, events, method):
+    return [n for n, _, _ in _checkpoints(lineage_directory(directory, events), method)]
+
+
+@pytest.mark.parametrize("method", ["FIFO", "Weighted Average"])
+def test_checkpoints_resume_and_invalidate(tmp_path, method):
+    events = random_events(np.random.default_rng(3), 600)
+    full, _ = advance(LayerState(method), events, keep_flow=False)
+    for n in (200, 400, 600):
+        value_incrementally(events.iloc[:n], method, tmp_path)
+    assert saved_positions(tmp_path, events, method) == [200, 400, 600]
+
+    state, resumed_from, _ = value_incrementally(events, method, tmp_path)
+    assert resumed_from == 600
+    assert state.cogs == pytest.approx(full.cogs)
+
+    # Halving a sale between 200 and 400 keeps the checkpoint at 200 and drops the later ones
+    edited = events.copy()
+    i = 300 + int(np.argmax(edited["Sale"].to_numpy()[300:]))
+    edited.loc[i, "Qty"] = edited.loc[i, "Qty"] / 2
+    expected, _ = advance(LayerState(method), edited, keep_flow=False)
+    state, resumed_from, _ = value_incrementally(edited, method, tmp_path)
+    assert resumed_from == 200
+    assert state.cogs == pytest.approx(expected.cogs)
+    assert state.ending_inventory == pytest.approx(expected.ending_inventory)
+    assert saved_positions(tmp_path, events, method) == [200, 600]
+
+
+def test_unreadable_checkpoint_is_replaced(tmp_path):
+    events = random_events(np.random.default_rng(4), 300)
+    value_incrementally(events, "LIFO", tmp_path)
+    (_, _, path), = _checkpoints(lineage_directory(tmp_path, events), "LIFO")
+    with open(path, "wb") as f:
+        f.write(b"not a checkpoint")
+
+    state, resumed_from, _ = value_incrementally(events, "LIFO", tmp_path)
+    assert resumed_from == 0
+    assert value_incrementally(events, "LIFO", tmp_path)[1] == 300
+
+
+def test_other_histories_keep_their_checkpoints(tmp_path):
+    a = random_events(np.random.default_rng(5), 300)
+    b = random_events(np.random.default_rng(6), 300)
+    value_incrementally(a, "FIFO", tmp_path, "a.csv")
+    value_incrementally(b, "FIFO", tmp_path, "b.csv")
+    assert value_incrementally(a, "FIFO", tmp_path, "a.csv")[1] == 300
+    assert value_incrementally(b, "FIFO", tmp_path, "b.csv")[1] == 300
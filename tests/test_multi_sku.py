@@ -0,0 +1,123 @@
+# tests/test_multi_sku.py
+#
+# value_skus checked SKU by SKU against periodic_layers and a plain-Python
+# weighted average.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting.inventory import periodic_layers
+from accounting.multi_sku import METHODS, SKU_COLUMNS, value_skus
+
+
+# ------------------------------
+# ✅ Per-SKU reference
+# ------------------------------
+def sku_label(value):
+    return str(int(value)) if isinstance(value, (int, float, np.integer, np.floating)) else str(value).strip()
+
+
+def reference(purchases, sales, method):
+    """One row per SKU, valued with periodic_layers / a plain average."""
+    sold = {}
+    for sku, qty in zip(sales["SKU"], sales["Qty"]):
+        sold[sku_label(sku)] = sold.get(sku_label(sku), 0.0) + qty
+
+    layers, methods = {}, {}
+    has_method = "Method" in purchases
+    for i in range(len(purchases)):
+        row = purchases.iloc[i]
+        sku = sku_label(row["SKU"])
+        layers.setdefault(sku, []).append((row["Qty"], row["Cost"]))
+        if has_method and isinstance(row["Method"], str) and sku not in methods:
+            methods[sku] = row["Method"]
+
+    rows = []
+    for sku in sorted(set(layers) | set(sold)):
+        qty = np.array([q for q, _ in layers.get(sku, [])], dtype=float)
+        cost = np.array([c for _, c in layers.get(sku, [])], dtype=float)
+        sku_method = methods.get(sku, method)
+        total_sold = sold.get(sku, 0.0)
+        costed = min(total_sold, qty.sum())
+        if sku_method == "Weighted Average":
+            avg = (qty * cost).sum() / qty.sum() if qty.sum() > 0 else 0.0
+            cogs, ending = costed * avg, (qty.sum() - costed) * avg
+        else:
+            cogs, ending, _, _ = periodic_layers(qty, cost, total_sold, sku_method)
+        rows.append((sku, sku_method, total_sold, cogs, ending, total_sold - costed))
+    return pd.DataFrame(rows, columns=SKU_COLUMNS)
+
+
+def assert_matches(per_sku, expected):
+    pd.testing.assert_frame_equal(
+        per_sku.reset_index(drop=True), expected, check_dtype=False, rtol=1e-9, atol=1e-9,
+    )
+
+
+# ------------------------------
+# ✅ Random multi-SKU inputs
+# ------------------------------
+def random_inputs(seed, with_methods):
+    rng = np.random.default_rng(seed)
+    pool = [1001, "1001", " 1002 ", 1002, "A-12", "B-7", 33, "C-1"]
+    n = 400
+    purchases = pd.DataFrame({
+        "SKU": [pool[i] for i in rng.integers(0, len(pool), n)],
+        "Qty": rng.integers(0, 30, n).astype(float),
+        "Cost": rng.choice([2.0, 3.5, 5.0, 7.25], n),
+    })
+    if with_methods:
+        # Overrides with gaps: most rows leave Method blank
+        purchases["Method"] = rng.choice([*METHODS, None, None, None], n)
+    sales = pd.DataFrame({
+        "SKU": [pool[i] for i in rng.integers(0, len(pool), 60)] + ["Z9", "Z9"],
+        "Qty": np.r_[rng.integers(1, 120, 60), 4, 1].astype(float),
+    })
+    return purchases, sales
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("with_methods", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_value_skus_matches_reference(method, with_methods, seed):
+    purchases, sales = random_inputs(seed, with_methods)
+    expected = reference(purchases, sales, method)
+
+    serial, serial_totals = value_skus(purchases, sales, method, workers=1)
+    assert_matches(serial, expected)
+    assert serial_totals["SKUs"] == len(expected)
+    assert serial_totals["COGS"] == pytest.approx(expected["COGS"].sum())
+    assert serial_totals["Oversold SKUs"] == int((expected["Shortfall"] > 0).sum())
+
+    parallel, parallel_totals = value_skus(purchases, sales, method, workers=2)
+    assert_matches(parallel, expected)
+    assert parallel_totals == serial_totals
+
+
+@pytest.mark.parametrize("method, cogs", [("FIFO", 5.0), ("LIFO", 10.0), ("Weighted Average", 7.5)])
+def test_default_method_applies_without_method_column(method, cogs):
+    purchases = pd.DataFrame({"SKU": ["a", "a"], "Qty": [10.0, 10.0], "Cost": [1.0, 2.0]})
+    sales = pd.DataFrame({"SKU": ["a"], "Qty": [5.0]})
+    per_sku, _ = value_skus(purchases, sales, method, workers=1)
+    assert per_sku.loc[0, "Method"] == method
+    assert per_sku.loc[0, "COGS"] == pytest.approx(cogs)
+
+
+def test_oversold_and_never_purchased_skus():
+    purchases = pd.DataFrame({"SKU": [1001, "1001", "b"], "Qty": [3.0, 2.0, 4.0], "Cost": [1.0, 2.0, 5.0]})
+    sales = pd.DataFrame({"SKU": ["1001", "b", "ghost"], "Qty": [8.0, 1.0, 6.0]})
+    per_sku, totals = value_skus(purchases, sales, "FIFO", workers=1)
+
+    assert per_sku["SKU"].tolist() == ["1001", "b", "ghost"]
+    assert per_sku["Shortfall"].tolist() == [3.0, 0.0, 6.0]
+    assert per_sku["COGS"].tolist() == [7.0, 5.0, 0.0]
+    assert per_sku["Ending Inventory"].tolist() == [0.0, 15.0, 0.0]
+    assert totals["Oversold SKUs"] == 2
+
+
+def test_unknown_method_is_rejected():
+    purchases = pd.DataFrame({"SKU": ["a"], "Qty": [1.0], "Cost": [1.0], "Method": ["Specific ID"]})
+    sales = pd.DataFrame({"SKU": ["a"], "Qty": [1.0]})
+    with pytest.raises(ValueError, match="Specific ID"):
+        value_skus(purchases, sales, "FIFO", workers=1)
@@ -0,0 +1,121 @@
+# tests/test_parsing.py
+#
+# Pasted-text parsing: the typed first read, the row-by-row recheck of the
+# lines it rejects and the str.split fallback must agree on rows and on
+# the exact (Line, Error) report.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting.parsing import parse_purchases, parse_sales, purchases_from_records, sales_from_records
+
+NaT = pd.NaT
+QTY = "Qty must be a non-negative number"
+COST = "Cost must be a non-negative number"
+SALES_QTY = "Sales Qty must be a non-negative number"
+FIELDS = "expected 2 or 3 comma-separated values"
+DATE = "Date is not a valid date"
+
+
+def errors_of(errors):
+    return list(errors.itertuples(index=False, name=None))
+
+
+def check(result, table, errors):
+    parsed, parsed_errors = result
+    pd.testing.assert_frame_equal(parsed, pd.DataFrame(table), check_dtype=False)
+    assert errors_of(parsed_errors) == errors
+
+
+# ------------------------------
+# ✅ Purchases
+# ------------------------------
+@pytest.mark.parametrize("text, table, errors", [
+    pytest.param(
+        "2025-01-01, 10, 5\n3, 4\n2025-01-03, 5, 6",
+        {"Date": [pd.Timestamp("2025-01-01"), NaT, pd.Timestamp("2025-01-03")],
+         "Qty": [10.0, 3.0, 5.0], "Cost": [5.0, 4.0, 6.0]},
+        [], id="3-field layout with a 2-field line",
+    ),
+    pytest.param(
+        "10, 5\n2025-01-02, 3, 4",
+        {"Date": [NaT, pd.Timestamp("2025-01-02")], "Qty": [10.0, 3.0], "Cost": [5.0, 4.0]},
+        [], id="2-field layout with a 3-field line",
+    ),
+    pytest.param(
+        "10, 5\n\n   \n-1, 4\n3, 4\n",
+        {"Qty": [10.0, 3.0], "Cost": [5.0, 4.0]},
+        [(4, QTY)], id="blank lines keep line numbers",
+    ),
+    pytest.param(
+        "nan, 3\n1, inf\n-2, 4\n5, 6\n1, -inf",
+        {"Qty": [5.0], "Cost": [6.0]},
+        [(1, QTY), (2, COST), (3, QTY), (5, COST)], id="nan, inf and negatives",
+    ),
+    pytest.param(
+        "1,2,3,4,5\n5, 6",
+        {"Qty": [5.0], "Cost": [6.0]},
+        [(1, FIELDS)], id="over-long first line",
+    ),
+    pytest.param(
+        "1, 2\n1,2,3,4,5\n3, 4\n7",
+        {"Qty": [1.0, 3.0], "Cost": [2.0, 4.0]},
+        [(2, FIELDS), (4, FIELDS)], id="over-long later line falls back to str.split",
+    ),
+    pytest.param(
+        "2025-01-01, 1, 2\n2025-01-02, 1, 2, 9\n2025-01-03, 3, 4",
+        {"Date": [pd.Timestamp("2025-01-01"), pd.Timestamp("2025-01-03")], "Qty": [1.0, 3.0], "Cost": [2.0, 4.0]},
+        [(2, FIELDS)], id="one extra field is rechecked",
+    ),
+    pytest.param(
+        "2025-13-01, 1, 2\n01/03/2025, 3, 4\n2025-01-02, 5, 6",
+        {"Date": [pd.Timestamp("2025-01-03"), pd.Timestamp("2025-01-02")], "Qty": [3.0, 5.0], "Cost": [4.0, 6.0]},
+        [(1, DATE)], id="bad and non-ISO dates",
+    ),
+    pytest.param(
+        "10, 5\r\n\r\nabc, 4\r\n2025-01-02, 1, 2\r\n",
+        {"Date": [NaT, pd.Timestamp("2025-01-02")], "Qty": [10.0, 1.0], "Cost": [5.0, 2.0]},
+        [(3, QTY)], id="CRLF line endings",
+    ),
+])
+def test_parse_purchases(text, table, errors):
+    check(parse_purchases(text), table, errors)
+
+
+def test_one_bad_line_in_a_long_paste():
+    lines = [f"2025-01-{1 + i % 28:02d}, {i % 7 + 1}, 2.5" for i in range(5_000)]
+    lines[3_141] = "2025-01-01, abc, 2.5"
+    table, errors = parse_purchases("\n".join(lines))
+    assert len(table) == 4_999
+    assert errors_of(errors) == [(3_142, QTY)]
+    expected_qty = np.array([i % 7 + 1 for i in range(5_000) if i != 3_141], dtype=float)
+    np.testing.assert_array_equal(table["Qty"].to_numpy(), expected_qty)
+
+
+def test_empty_text():
+    check(parse_purchases("\n  \n"), {"Qty": [], "Cost": []}, [])
+
+
+# ------------------------------
+# ✅ Sales and records
+# ------------------------------
+def test_parse_sales():
+    check(
+        parse_sales("nan\n4\ninf\n\n2025-01-02, 3"),
+        {"Date": [NaT, pd.Timestamp("2025-01-02")], "Sales Qty": [4.0, 3.0]},
+        [(1, SALES_QTY), (3, SALES_QTY)],
+    )
+
+
+def test_records_reject_non_finite_values():
+    check(
+        purchases_from_records([{"Qty": 1, "Cost": float("inf")}, {"Qty": 2, "Cost": 3}]),
+        {"Qty": [2.0], "Cost": [3.0]},
+        [(1, COST)],
+    )
+
+
+def test_empty_records():
+    check(purchases_from_records([]), {"Qty": [], "Cost": []}, [])
+    check(sales_from_records([]), {"Sales Qty": []}, [])
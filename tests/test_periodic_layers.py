@@ -0,0 +1,77 @@
+# tests/test_periodic_layers.py
+#
+# periodic_layers checked against a plain-Python walk over the layers.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting.inventory import periodic_layers
+
+
+def reference_walk(qty, cost, total_sales, method):
+    """Consume `total_sales` layer by layer; same return shape as periodic_layers."""
+    order = list(range(len(qty))) if method == "FIFO" else list(reversed(range(len(qty))))
+    remaining = [float(q) for q in qty]
+    rows, left = [], float(total_sales)
+    for i in order:
+        if left <= 0:
+            break
+        use = min(remaining[i], left)
+        rows.append((use, float(cost[i]), use * cost[i]))
+        remaining[i] -= use
+        left -= use
+    cogs = sum(total for _, _, total in rows)
+    ending = sum(q * c for q, c in zip(remaining, cost))
+    flow = pd.DataFrame(rows, columns=["Qty Used", "Cost", "Total Cost"], dtype=float)
+    return cogs, ending, flow, np.array(remaining)
+
+
+def assert_matches(qty, cost, total_sales, method):
+    cogs, ending, flow, remaining = periodic_layers(qty, cost, total_sales, method)
+    ref_cogs, ref_ending, ref_flow, ref_remaining = reference_walk(qty, cost, total_sales, method)
+    assert cogs == pytest.approx(ref_cogs)
+    assert ending == pytest.approx(ref_ending)
+    pd.testing.assert_frame_equal(flow.reset_index(drop=True), ref_flow, check_dtype=False)
+    np.testing.assert_allclose(remaining, ref_remaining)
+
+
+@pytest.mark.parametrize("method", ["FIFO", "LIFO"])
+@pytest.mark.parametrize("qty, cost, total_sales", [
+    # Duplicate unit costs stay separate layers
+    ([10, 5, 10, 5], [4.0, 4.0, 6.0, 4.0], 17),
+    # Zero-quantity layers at the start, middle and end
+    ([0, 5, 0, 5, 0], [1.0, 2.0, 3.0, 4.0, 5.0], 7),
+    # Sales ending exactly on a layer boundary
+    ([5, 5, 5], [1.0, 2.0, 3.0], 10),
+    ([5, 0, 5], [1.0, 2.0, 3.0], 5),
+    # Sales beyond the total purchased
+    ([3, 4], [2.0, 5.0], 20),
+    # Nothing sold, nothing purchased
+    ([3, 4], [2.0, 5.0], 0),
+    ([], [], 5),
+])
+def test_periodic_layers_edge_cases(method, qty, cost, total_sales):
+    assert_matches(np.array(qty, dtype=float), np.array(cost, dtype=float), total_sales, method)
+
+
+@pytest.mark.parametrize("method", ["FIFO", "LIFO"])
+@pytest.mark.parametrize("seed", range(20))
+def test_periodic_layers_random(method, seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 40))
+    qty = rng.integers(0, 10, n).astype(float)
+    cost = rng.choice([1.0, 2.5, 4.0], n)  # few distinct costs, so many repeats
+    total_sales = float(rng.integers(0, qty.sum() + 10))
+    assert_matches(qty, cost, total_sales, method)
+
+
+def test_remaining_is_in_purchase_order():
+    qty, cost = np.array([2.0, 3.0, 4.0]), np.array([1.0, 1.0, 1.0])
+    assert periodic_layers(qty, cost, 4, "FIFO")[3].tolist() == [0.0, 1.0, 4.0]
+    assert periodic_layers(qty, cost, 4, "LIFO")[3].tolist() == [2.0, 3.0, 0.0]
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported layer method"):
+        periodic_layers([1.0], [1.0], 1, "Weighted Average")